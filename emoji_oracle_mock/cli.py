@@ -1,38 +1,182 @@
 from __future__ import annotations
 
-import argparse
+import dataclasses
+import functools
+import os
+import sys
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .config_model import MockConfig
-from .generate import generate_all
 
+if TYPE_CHECKING:
+    import argparse
+
+
+_DEFAULT_OUT = Path("./mock/output")
+
+_KINDS = ("raw", "derived", "both")
+_KIND_SET = frozenset(_KINDS)
+
+# Printed for a -h/--help flag without importing argparse. It follows argparse's layout,
+# but the wrapping of the usage lines is left to this text: tests/test_cli.py checks that
+# it matches _get_parser().format_help() token for token, ignoring whitespace.
+_STATIC_HELP = """\
+usage: {prog} [-h] [--out OUT] [--config CONFIG] [--schema-from SCHEMA_FROM]
+       [--kind {{raw,derived,both}}] [--seed SEED] [--users USERS] [--days DAYS]
+       [--parquet]
+
+Generate synthetic CSV datasets for emoji-oracle-analytics.
+
+options:
+  -h, --help            show this help message and exit
+  --out OUT             Output folder root.
+  --config CONFIG       Optional JSON config overriding defaults.
+  --schema-from SCHEMA_FROM
+                        Folder containing existing CSVs to mirror headers
+                        from.
+  --kind {{raw,derived,both}}
+                        What to generate: raw (pull_from_bq-like), derived CSV
+                        outputs, or both.
+  --seed SEED           Random seed (overrides config).
+  --users USERS         Number of users (overrides config).
+  --days DAYS           Number of days (overrides config).
+  --parquet             Write derived tables as .parquet instead of .csv
+                        (needs pyarrow; falls back to CSV without it).
+"""
+
+# Long-only options the fast path understands; value is the converter.
+_SPECS = {
+    "--out": str,
+    "--config": str,
+    "--schema-from": str,
+    "--kind": str,
+    "--seed": int,
+    "--users": int,
+    "--days": int,
+}
+# Int options that must not be negative; checked in main() for both parse paths.
+_NON_NEGATIVE = ("seed", "users", "days")
+# Valueless switches the fast path understands.
+_SWITCHES = frozenset({"--parquet"})
+_HELP_FLAGS = frozenset({"-h", "--help"})
+
+
+@dataclass
+class _Args:
+    out: str | Path = _DEFAULT_OUT
+    config: str | None = None
+    schema_from: str | None = None
+    kind: str = "raw"
+    seed: int | None = None
+    users: int | None = None
+    days: int | None = None
+    parquet: bool = False
+    help: bool = False
+
+
+def _fast_parse(argv: list[str]) -> _Args | None:
+    """Parse the fixed option set without argparse.
+
+    Returns None for anything unusual (unknown/abbreviated flags, missing or
+    invalid values) so the caller can fall back to argparse and keep its usage
+    and error messages. A -h/--help flag stops the scan like argparse's help
+    action does; the same token in a value position is left to the value check.
+    """
+    values: dict[str, object] = {}
+    i = 0
+    n = len(argv)
+    while i < n:
+        if argv[i] in _HELP_FLAGS:
+            return _Args(help=True)
+        if argv[i] in _SWITCHES:
+            values[argv[i][2:]] = True
+            i += 1
+            continue
+        flag, sep, value = argv[i].partition("=")
+        convert = _SPECS.get(flag)
+        if convert is None:
+            return None
+        if not sep:
+            i += 1
+            # argparse takes a following "-..." token as a value only when it is a
+            # negative number; anything else leaves the option without its argument
+            if i >= n or (argv[i].startswith("-") and not (convert is int and argv[i][1:].isdigit())):
+                return None
+            value = argv[i]
+        try:
+            values[flag[2:].replace("-", "_")] = convert(value)
+        except ValueError:
+            return None
+        i += 1
+
+    if values.get("kind", "raw") not in _KIND_SET:
+        return None
+    return _Args(**values)
+
+
+@functools.cache
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the fallback parser once per process; repeated main() calls reuse it."""
+    import argparse
 
-def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Generate synthetic CSV datasets for emoji-oracle-analytics.")
-    parser.add_argument("--out", type=Path, default=Path("./mock/output"), help="Output folder root.")
-    parser.add_argument("--config", type=Path, default=None, help="Optional JSON config overriding defaults.")
-    parser.add_argument("--schema-from", type=Path, default=None, help="Folder containing existing CSVs to mirror headers from.")
+    parser.add_argument("--out", type=str, default=_DEFAULT_OUT, help="Output folder root.")
+    parser.add_argument("--config", type=str, default=None, help="Optional JSON config overriding defaults.")
+    parser.add_argument("--schema-from", type=str, default=None, help="Folder containing existing CSVs to mirror headers from.")
 
     parser.add_argument(
         "--kind",
-        choices=["raw", "derived", "both"],
         default="raw",
+        metavar="{" + ",".join(_KINDS) + "}",
         help="What to generate: raw (pull_from_bq-like), derived CSV outputs, or both.",
     )
 
     parser.add_argument("--seed", type=int, default=None, help="Random seed (overrides config).")
     parser.add_argument("--users", type=int, default=None, help="Number of users (overrides config).")
     parser.add_argument("--days", type=int, default=None, help="Number of days (overrides config).")
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Write derived tables as .parquet instead of .csv (needs pyarrow; falls back to CSV without it).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+
+    args = _fast_parse(argv)
+    if args is not None and args.help:
+        sys.stdout.write(_STATIC_HELP.format(prog=os.path.basename(sys.argv[0])))
+        return 0
+    if args is None:
+        parser = _get_parser()
+        args = parser.parse_args(argv)
+        if args.kind not in _KIND_SET:
+            parser.error(f"argument --kind: invalid choice: {args.kind!r} (choose from {', '.join(map(repr, _KINDS))})")
+
+    for name in _NON_NEGATIVE:
+        value = getattr(args, name)
+        if value is not None and value < 0:
+            _get_parser().error(f"argument --{name}: must be a non-negative integer: {value}")
+
+    # Path objects are built once here rather than by the parser's converters.
+    out = Path(args.out)
+    config = Path(args.config) if args.config else None
+    schema_from = Path(args.schema_from) if args.schema_from else None
 
-    args = parser.parse_args(argv)
+    cfg = MockConfig.load(config)
+    overrides = {
+        k: v for k, v in (("seed", args.seed), ("users", args.users), ("days", args.days)) if v is not None
+    }
+    if overrides:
+        cfg = dataclasses.replace(cfg, **overrides)
 
-    cfg = MockConfig.load(args.config)
-    if args.seed is not None:
-        cfg.seed = args.seed
-    if args.users is not None:
-        cfg.users = args.users
-    if args.days is not None:
-        cfg.days = args.days
+    # Deferred so --help and argument errors never pay for the pandas/numpy import.
+    from .generate import generate_all
 
-    generate_all(cfg=cfg, out_root=args.out, schema_from=args.schema_from, kind=args.kind)
+    generate_all(cfg=cfg, out_root=out, schema_from=schema_from, kind=args.kind, parquet=args.parquet)
     return 0
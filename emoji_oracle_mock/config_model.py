@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 
+try:  # optional: faster JSON decoding straight from bytes
+    import msgspec
+except ImportError:
+    msgspec = None
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class VocabConfig:
     # Character names used in event_params__character_name
-    characters: list[str] = field(default_factory=lambda: ["t", "mi", "la", "so"])
+    characters: tuple[str, ...] = ("t", "mi", "la", "so")
     special_character_for_offsets: str = "t"
 
     # Energy-like items used in event_params__spent_to
@@ -29,8 +34,20 @@ class VocabConfig:
     wheel_impression_ri: str = "Daily Spin"
     wheel_skip_ri: str = "spin_skipped"
 
+    # Derived once from the names above; the generators sample from these per event
+    energy_items: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    consumable_items: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "energy_items", (self.alicin_name, self.coffee_name, self.cauldron_name))
+        object.__setattr__(self, "consumable_items", (self.potion_name, self.incense_name, self.amulet_name))
+
+    def __reduce__(self):
+        # Positional init args only; __post_init__ rebuilds the derived fields on unpickle.
+        return (type(self), tuple(getattr(self, f.name) for f in fields(self) if f.init))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class MockConfig:
     seed: int = 7
 
@@ -40,13 +57,13 @@ class MockConfig:
     avg_sessions_per_user: float = 2.2
 
     # Question progression
-    tiers: list[int] = field(default_factory=lambda: [1, 2, 3, 4])
+    tiers: tuple[int, ...] = (1, 2, 3, 4)
     questions_per_tier: int = 12
 
     # Distribution / metadata
-    countries: list[str] = field(default_factory=lambda: ["United States", "Türkiye"])
-    app_versions: list[str] = field(default_factory=lambda: ["1.0.5", "1.0.6", "1.0.7"])
-    operating_systems: list[str] = field(default_factory=lambda: ["ANDROID", "IOS"])
+    countries: tuple[str, ...] = ("United States", "Türkiye")
+    app_versions: tuple[str, ...] = ("1.0.5", "1.0.6", "1.0.7")
+    operating_systems: tuple[str, ...] = ("ANDROID", "IOS")
 
     vocab: VocabConfig = field(default_factory=VocabConfig)
 
@@ -54,13 +71,38 @@ class MockConfig:
     def load(path: Path | None) -> "MockConfig":
         if path is None:
             return MockConfig()
-        raw = json.loads(path.read_text(encoding="utf-8"))
+        data = path.read_bytes()
+        raw = msgspec.json.decode(data) if msgspec is not None else json.loads(data)
         return MockConfig.from_dict(raw)
 
+    def __reduce__(self):
+        # Cheap to pickle for worker processes: the class plus its positional init args.
+        return (type(self), tuple(getattr(self, f.name) for f in fields(self)))
+
+    def to_dict(self) -> dict:
+        """Inverse of from_dict; derived (init=False) vocab fields are left out."""
+        d = {f.name: getattr(self, f.name) for f in fields(self)}
+        d["vocab"] = {f.name: getattr(self.vocab, f.name) for f in fields(self.vocab) if f.init}
+        return d
+
     @staticmethod
     def from_dict(d: dict) -> "MockConfig":
-        vocab_dict = d.get("vocab", {})
-        vocab = VocabConfig(**vocab_dict)
+        if not d:
+            return MockConfig()
+        vocab = d.get("vocab")
+        vocab = VocabConfig(**_lists_to_tuples(vocab)) if vocab else VocabConfig()
 
-        cfg_kwargs = {k: v for k, v in d.items() if k != "vocab"}
+        cfg_kwargs = _lists_to_tuples({k: d[k] for k in MockConfig._FIELDS & d.keys()})
+        if len(cfg_kwargs) + ("vocab" in d) != len(d):
+            unknown = sorted(d.keys() - MockConfig._FIELDS - {"vocab"})
+            raise TypeError(f"Unknown MockConfig keys: {', '.join(unknown)}")
         return MockConfig(vocab=vocab, **cfg_kwargs)
+
+
+def _lists_to_tuples(d: dict) -> dict:
+    # JSON arrays arrive as lists; the configs hold read-only vocab as tuples.
+    return {k: (tuple(v) if isinstance(v, list) else v) for k, v in d.items()}
+
+
+# Field names cached once so from_dict avoids per-call dataclass introspection.
+MockConfig._FIELDS = frozenset(f.name for f in fields(MockConfig)) - {"vocab"}
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import asdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 import json
+import time
 
 from .config_model import MockConfig
 from .schema_utils import ensure_columns, read_csv_header
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 
 SKIP_LAST_EVENTS = {
     "User Engagement",
@@ -31,6 +35,54 @@ TURKISH_WEEKDAYS = {
     5: "Cumartesi",
     6: "Pazar",
 }
+TURKISH_WEEKDAYS_ARR = np.array([TURKISH_WEEKDAYS[d] for d in range(7)], dtype=object)
+
+# Vectorised twins of _daytime_named: bucket lower bounds and their names
+DAYTIME_BINS = np.array([0, 6, 12, 18])
+DAYTIME_NAMES = np.array(["Gece", "Sabah", "Öğle", "Akşam"], dtype=object)
+WEEKEND_NAMES = np.array(["Hafta İçi", "Hafta Sonu"], dtype=object)  # indexed by is_weekend
+
+# cumulative_question_index offset, indexed by [tier, is_special_character]
+TIER_OFFSETS = np.array([
+    [0, 0],
+    [0, 0],
+    [16, 12],
+    [28, 24],
+    [40, 36],
+])
+
+# Event times are built as int64 nanoseconds since the epoch and converted once at the end
+SECOND_NS = 1_000_000_000
+MINUTE_NS = 60 * SECOND_NS
+DAY_NS = 1440 * MINUTE_NS
+
+# Raw struct/list columns that hold one shared object per user (see _build_raw_events)
+PER_USER_RAW_COLS = ("device", "geo", "app_info", "traffic_source", "privacy_info", "user_properties")
+
+# Repeated string keys of the derived event frame, stored as categoricals before the
+# _df_by_* tables are built so their groupbys and comparisons work on int codes
+DERIVED_CATEGORICAL_COLS = (
+    "user_pseudo_id",
+    "event_name",
+    "device__operating_system",
+    "event_params__spent_to",
+    "shop_consumable_item",
+    "event_params__currency_name",
+    "event_params__menu_name",
+    "geo__country",
+)
+
+# Rows converted to Arrow per step when streaming a large frame to parquet
+PARQUET_CHUNK_ROWS = 100_000
+# pyarrow writer options: zstd packs the repetitive string/nested columns far tighter than the snappy default
+PARQUET_WRITE_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "use_dictionary": True,
+    "write_statistics": True,
+}
+# Rows per parquet row group; streamed chunks are buffered up to this before each write
+PARQUET_ROW_GROUP_SIZE = 1_000_000
 
 
 def _daytime_named(hour: int) -> str:
@@ -47,9 +99,16 @@ def _is_weekend(weekday: int) -> str:
     return "Hafta Sonu" if weekday >= 5 else "Hafta İçi"
 
 
-def _random_hex(rng: np.random.Generator, n: int = 32) -> str:
-    alphabet = np.array(list("0123456789abcdef"))
-    return "".join(rng.choice(alphabet, size=n))
+def _start_ns(cfg: MockConfig) -> int:
+    """UTC midnight `cfg.days - 1` days before today, as int64 nanoseconds since the epoch."""
+    return (time.time_ns() // DAY_NS - (cfg.days - 1)) * DAY_NS
+
+
+def _random_hex(rng: np.random.Generator, size: int, n: int = 32) -> np.ndarray:
+    """`size` random lowercase hex ids of `n` chars each, sliced from one rng.bytes() draw."""
+    step = n + (n % 2)
+    blob = rng.bytes(size * step // 2).hex()
+    return np.array([blob[i:i + n] for i in range(0, size * step, step)], dtype=object)
 
 
 def _param(key: str, value) -> dict:
@@ -69,633 +128,814 @@ def _param(key: str, value) -> dict:
     return {"key": key, "value": payload}
 
 
-def _maybe_write_parquet(df: pd.DataFrame, path: Path) -> bool:
-    """Write parquet if pyarrow is available; return True if written."""
+def _has_pyarrow() -> bool:
     try:
         import pyarrow  # noqa: F401
     except Exception:
         return False
+    return True
 
-    df.to_parquet(path, index=False)
+
+def _maybe_write_parquet(
+    df: pd.DataFrame | pa.Table,
+    path: Path,
+    chunk_rows: int = PARQUET_CHUNK_ROWS,
+    row_group_rows: int = PARQUET_ROW_GROUP_SIZE,
+) -> bool:
+    """Write parquet if pyarrow is available; return True if written.
+
+    A pyarrow.Table is written as is. Large frames are converted to Arrow `chunk_rows` rows
+    at a time and streamed through one ParquetWriter. Converted chunks are buffered until
+    they fill a `row_group_rows` row group, so peak memory holds one row group's Arrow copy
+    instead of the whole frame's.
+    """
+    if not _has_pyarrow():
+        return False
+
+    if not isinstance(df, pd.DataFrame):
+        import pyarrow.parquet as pq
+
+        pq.write_table(df, path, row_group_size=row_group_rows, **PARQUET_WRITE_OPTIONS)
+        return True
+
+    if len(df) <= chunk_rows:
+        df.to_parquet(path, index=False, row_group_size=row_group_rows, **PARQUET_WRITE_OPTIONS)
+        return True
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # one schema for every chunk, so sparse columns can't infer as null in some of them
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema, **PARQUET_WRITE_OPTIONS) as writer:
+        pending = schema.empty_table()
+        for lo in range(0, len(df), chunk_rows):
+            chunk = pa.Table.from_pandas(df.iloc[lo:lo + chunk_rows], schema=schema, preserve_index=False)
+            pending = pa.concat_tables([pending, chunk])
+            # every write_table call closes its row groups, so write whole groups only and
+            # carry the remainder (zero-copy slices) into the next one
+            full = len(pending) // row_group_rows * row_group_rows
+            if full:
+                writer.write_table(pending.slice(0, full), row_group_size=row_group_rows)
+                pending = pending.slice(full)
+        if len(pending):
+            writer.write_table(pending, row_group_size=row_group_rows)
     return True
 
 
+def _raw_arrow_schema() -> pa.Schema:
+    """Explicit Arrow types for the raw frame's parquet copy, nested GA4 fields included.
+
+    Columns the generator always leaves empty keep the null types they would infer to.
+    """
+    import pyarrow as pa
+
+    def strings(*names: str) -> pa.StructType:
+        return pa.struct([(n, pa.string()) for n in names])
+
+    label = pa.dictionary(pa.int32(), pa.string())
+    params = pa.list_(pa.struct([
+        ("key", pa.string()),
+        ("value", pa.struct([("string_value", pa.string()), ("int_value", pa.int64()), ("double_value", pa.float64())])),
+    ]))
+    return pa.schema([
+        ("event_date", label),
+        ("event_timestamp", pa.int64()),
+        ("event_name", label),
+        ("event_previous_timestamp", pa.int64()),
+        ("event_value_in_usd", pa.null()),
+        ("event_bundle_sequence_id", pa.int64()),
+        ("event_server_timestamp_offset", pa.int64()),
+        ("user_id", pa.null()),
+        ("user_pseudo_id", pa.string()),
+        ("user_first_touch_timestamp", pa.int64()),
+        ("stream_id", pa.string()),
+        ("platform", label),
+        ("is_active_user", pa.bool_()),
+        ("batch_event_index", pa.int64()),
+        ("batch_page_id", pa.null()),
+        ("batch_ordering_id", pa.null()),
+        ("device", pa.struct([
+            ("category", pa.string()),
+            ("operating_system", pa.string()),
+            ("operating_system_version", pa.string()),
+            ("language", pa.string()),
+            ("is_limited_ad_tracking", pa.string()),
+            ("time_zone_offset_seconds", pa.int64()),
+            ("mobile_brand_name", pa.string()),
+            ("mobile_model_name", pa.string()),
+            ("mobile_marketing_name", pa.string()),
+        ])),
+        ("geo", strings("country", "continent", "city", "region")),
+        ("app_info", strings("version", "install_source", "id")),
+        ("traffic_source", pa.struct([("name", pa.null()), ("medium", pa.null()), ("source", pa.null())])),
+        ("privacy_info", strings("ads_storage", "analytics_storage", "uses_transient_token")),
+        ("user_ltv", pa.null()),
+        ("event_params", params),
+        ("user_properties", params),
+        ("items", pa.list_(pa.null())),
+        ("item_params", pa.list_(pa.null())),
+        ("event_dimensions", pa.null()),
+        ("ecommerce", pa.null()),
+        ("collected_traffic_source", pa.null()),
+        ("shop_consumable_item", label),
+    ])
+
+
+def _raw_arrow_table(raw_df: pd.DataFrame) -> pa.Table:
+    """The raw frame as a pyarrow.Table typed by _raw_arrow_schema(); needs pyarrow.
+
+    Per-user structs are converted once per user and gathered per row with take(), and the
+    always-empty list/struct columns are built straight from offsets and null arrays, so
+    only event_params is converted row by row.
+    """
+    import pyarrow as pa
+
+    schema = _raw_arrow_schema()
+    n = len(raw_df)
+    user_codes, _ = pd.factorize(raw_df["user_pseudo_id"])
+    _, first_row = np.unique(user_codes, return_index=True)
+    take_users = pa.array(user_codes)
+
+    arrays = []
+    for f in schema:
+        col = raw_df[f.name]
+        if f.name in PER_USER_RAW_COLS:
+            arr = pa.array(col.iloc[first_row].tolist(), type=f.type).take(take_users)
+        elif pa.types.is_null(f.type):
+            arr = pa.nulls(n)
+        elif pa.types.is_list(f.type) and pa.types.is_null(f.type.value_type):
+            arr = pa.ListArray.from_arrays(pa.array(np.zeros(n + 1, dtype=np.int32)), pa.nulls(0))
+        elif pa.types.is_dictionary(f.type):
+            arr = pa.array(col.to_numpy(dtype=object), type=f.type.value_type, from_pandas=True).dictionary_encode()
+        elif f.name == "event_params":
+            arr = pa.array(col.tolist(), type=f.type)
+        else:
+            arr = pa.array(col.to_numpy(), type=f.type, from_pandas=True)
+        arrays.append(arr)
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _param_column(key: str, values, n: int) -> list[dict]:
+    """`_param(key, v)` for every v in one column, choosing the value kind once from its dtype."""
+    if not isinstance(values, (np.ndarray, list)):
+        payload = _param(key, values)["value"]
+        return [{"key": key, "value": dict(payload)} for _ in range(n)]
+
+    arr = np.asarray(values) if isinstance(values, list) else values
+    kind = arr.dtype.kind
+    if kind == "b":
+        return [{"key": key, "value": {"string_value": "true" if x else "false"}} for x in arr.tolist()]
+    if kind in "iu":
+        return [{"key": key, "value": {"int_value": x}} for x in arr.tolist()]
+    if kind == "f":
+        return [
+            {"key": key, "value": {"string_value": None} if x != x else {"double_value": x}}
+            for x in arr.tolist()
+        ]
+
+    items = arr.tolist() if isinstance(values, np.ndarray) else values
+    if all(type(x) is str for x in items):
+        return [{"key": key, "value": {"string_value": x}} for x in items]
+    return [_param(key, x) for x in items]
+
+
+def _params_rows(pairs: list[tuple[str, object]]) -> list[list[dict]]:
+    """Per-row GA4 param lists from (key, column) pairs; non-sequence values are broadcast as constants."""
+    n = len(pairs[0][1])
+    cols = [_param_column(k, v, n) for k, v in pairs]
+    return [list(row) for row in zip(*cols)]
+
+
+def _concat_blocks(blocks: list[dict[str, object]]) -> pd.DataFrame:
+    """Stack per-event-type column blocks into one frame; columns a block lacks are NA there."""
+    frames = [pd.DataFrame(b) for b in blocks]
+    non_empty = [f for f in frames if len(f)] or frames[:1]
+    return pd.concat(non_empty, ignore_index=True)
+
+
+def _object_array(items: list) -> np.ndarray:
+    """1-D object array holding `items` as-is (np.array would turn lists of lists into 2-D)."""
+    return np.fromiter(items, dtype=object, count=len(items))
+
+
+def _bool_str(mask: np.ndarray) -> np.ndarray:
+    return np.where(mask, "true", "false").astype(object)
+
+
+def _draw_user_fields(cfg: MockConfig, rng: np.random.Generator) -> dict[str, np.ndarray]:
+    """Per-user draws shared by both builders, plus the flat session arrays they imply.
+
+    Session-level arrays cover all sessions back to back: ``session_user`` maps each
+    session to its user and ``first_session`` is each user's offset into them.
+    """
+    n_users = cfg.users
+    n_chars = len(cfg.vocab.characters)
+
+    # sessions per user (at least 1)
+    sessions_per_user = np.maximum(1, rng.poisson(lam=max(cfg.avg_sessions_per_user, 0.1), size=n_users))
+    session_user = np.repeat(np.arange(n_users), sessions_per_user)
+    first_open_day = rng.integers(0, cfg.days, size=n_users)
+
+    return {
+        "sessions_per_user": sessions_per_user,
+        "first_session": np.cumsum(sessions_per_user) - sessions_per_user,
+        "session_user": session_user,
+        "first_open_day": first_open_day,
+        "session_day": rng.integers(first_open_day[session_user], cfg.days),
+        # each user unlocks a random prefix of their own character permutation
+        "n_unlocked": rng.integers(1, n_chars + 1, size=n_users),
+        "char_perm": rng.permuted(np.tile(np.arange(n_chars), (n_users, 1)), axis=1),
+    }
+
+
 def _build_raw_events(cfg: MockConfig) -> pd.DataFrame:
     """Build a DataFrame that matches the *raw* BigQuery pull shape (pre-flatten)."""
     rng = np.random.default_rng(cfg.seed)
 
-    start = pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=cfg.days - 1)
-    start = start.tz_localize("UTC") if start.tzinfo is None else start.tz_convert("UTC")
-
-    rows: list[dict] = []
-    event_bundle_seq = 1
-
-    # generate users
-    for _u in range(cfg.users):
-        user_id = None
-        user_pseudo_id = _random_hex(rng, 32)
-        stream_id = str(rng.integers(10_000_000_000, 99_999_999_999))
-        platform = str(rng.choice(cfg.operating_systems))  # e.g. ANDROID / IOS
-        is_active_user = True
-
-        country = str(rng.choice(cfg.countries))
-        app_version_start = str(rng.choice(cfg.app_versions))
-        app_version_now = str(rng.choice(cfg.app_versions))
-
-        # times
-        first_open_day = int(rng.integers(0, cfg.days))
-        first_open_dt = start + pd.Timedelta(days=first_open_day) + pd.Timedelta(minutes=int(rng.integers(0, 1440)))
-        user_first_touch_ts_us = int(first_open_dt.value // 1_000)  # microseconds
-
-        # user_properties: first_open_time (ms)
-        user_properties = [
-            _param("first_open_time", int(first_open_dt.value // 1_000_000)),
-            _param("ga_session_number", int(rng.integers(1, 8))),
-        ]
-
-        # base nested structs
-        device = {
+    start_ns = _start_ns(cfg)
+
+    def choice(values, size: int) -> np.ndarray:
+        # Integer draws into a string table: same stream as rng.choice, without its object-array overhead.
+        table = values if isinstance(values, np.ndarray) else np.asarray(values, dtype=object)
+        return table[rng.integers(0, len(table), size=size)]
+
+    # --- users -------------------------------------------------------------
+    n_users = cfg.users
+    uf = _draw_user_fields(cfg, rng)
+    user_pseudo_id = _random_hex(rng, n_users)
+    stream_id = np.array([str(x) for x in rng.integers(10_000_000_000, 99_999_999_999, size=n_users).tolist()], dtype=object)
+    platform = choice(cfg.operating_systems, n_users)  # e.g. ANDROID / IOS
+    country = choice(cfg.countries, n_users)
+    app_version_now = choice(cfg.app_versions, n_users)
+
+    # times
+    first_open_ns = start_ns + uf["first_open_day"] * DAY_NS + rng.integers(0, 1440, size=n_users) * MINUTE_NS
+    user_first_touch_ts_us = first_open_ns // 1_000  # microseconds
+
+    # user_properties: first_open_time (ms)
+    user_properties = _params_rows([
+        ("first_open_time", first_open_ns // 1_000_000),
+        ("ga_session_number", rng.integers(1, 8, size=n_users)),
+    ])
+
+    # base nested structs (one object per user, shared by all of that user's rows;
+    # gathered per event by fancy-indexing at the end)
+    device = [
+        {
             "category": "mobile",
-            "operating_system": platform,
-            "operating_system_version": str(rng.choice(["16", "17", "18", "Android 15", "Android 16"])),
-            "language": str(rng.choice(["en-us", "tr-tr"])),
-            "is_limited_ad_tracking": str(rng.choice(["Yes", "No"])),
-            "time_zone_offset_seconds": int(rng.choice([-18000, 0, 10800])),
-            "mobile_brand_name": str(rng.choice(["Samsung", "Google", "Apple"])),
-            "mobile_model_name": str(rng.choice(["Galaxy", "Pixel", "iPhone"])),
-            "mobile_marketing_name": str(rng.choice(["Galaxy S24", "Pixel 8", "iPhone 15"])) ,
+            "operating_system": os_name,
+            "operating_system_version": os_version,
+            "language": language,
+            "is_limited_ad_tracking": limited,
+            "time_zone_offset_seconds": tz_offset,
+            "mobile_brand_name": brand,
+            "mobile_model_name": model,
+            "mobile_marketing_name": marketing,
         }
-        geo = {
-            "country": country,
-            "continent": "Americas" if country == "United States" else "Europe",
-            "city": str(rng.choice(["San Antonio", "New York", "İstanbul", "Ankara", None])),
-            "region": str(rng.choice(["Texas", "NY", "Marmara", None])),
+        for os_name, os_version, language, limited, tz_offset, brand, model, marketing in zip(
+            platform.tolist(),
+            choice(["16", "17", "18", "Android 15", "Android 16"], n_users).tolist(),
+            choice(["en-us", "tr-tr"], n_users).tolist(),
+            choice(["Yes", "No"], n_users).tolist(),
+            choice(np.array([-18000, 0, 10800]), n_users).tolist(),
+            choice(["Samsung", "Google", "Apple"], n_users).tolist(),
+            choice(["Galaxy", "Pixel", "iPhone"], n_users).tolist(),
+            choice(["Galaxy S24", "Pixel 8", "iPhone 15"], n_users).tolist(),
+        )
+    ]
+    geo = [
+        {
+            "country": c,
+            "continent": "Americas" if c == "United States" else "Europe",
+            "city": city,
+            "region": region,
         }
-        app_info = {
-            "version": app_version_now,
-            "install_source": str(rng.choice(["com.android.vending", "apps.apple.com", None])),
+        for c, city, region in zip(
+            country.tolist(),
+            choice(["San Antonio", "New York", "İstanbul", "Ankara", "None"], n_users).tolist(),
+            choice(["Texas", "NY", "Marmara", "None"], n_users).tolist(),
+        )
+    ]
+    app_info = [
+        {
+            "version": version,
+            "install_source": source,
             "id": "com.GlyphexGames.EmojiOracle",
         }
-        privacy_info = {
-            "ads_storage": str(rng.choice(["Yes", "No"])),
-            "analytics_storage": str(rng.choice(["Yes", "No"])),
+        for version, source in zip(
+            app_version_now.tolist(),
+            choice(["com.android.vending", "apps.apple.com", "None"], n_users).tolist(),
+        )
+    ]
+    privacy_info = [
+        {
+            "ads_storage": ads,
+            "analytics_storage": analytics,
             "uses_transient_token": "No",
         }
-        traffic_source = {
-            "name": None,
-            "medium": None,
-            "source": None,
-        }
+        for ads, analytics in zip(choice(["Yes", "No"], n_users).tolist(), choice(["Yes", "No"], n_users).tolist())
+    ]
+    traffic_source = [{"name": None, "medium": None, "source": None} for _ in range(n_users)]
+
+    # --- sessions ----------------------------------------------------------
+    session_user = uf["session_user"]
+    first_session = uf["first_session"]
+    n_sessions = len(session_user)
+
+    ga_session_id = rng.integers(1_000_000_000, 9_999_999_999, size=n_sessions)
+    ga_session_number = np.arange(n_sessions) - first_session[session_user] + 1
+    session_start = start_ns + uf["session_day"] * DAY_NS + rng.integers(0, 1440, size=n_sessions) * MINUTE_NS
+
+    # --- questions (per-session gameplay) ----------------------------------
+    q_session = np.repeat(np.arange(n_sessions), rng.integers(1, 8, size=n_sessions))
+    n_q = len(q_session)
+    q_user = session_user[q_session]
+    dt_q = session_start[q_session] + rng.integers(5, 400, size=n_q) * SECOND_NS
+    characters = np.asarray(cfg.vocab.characters, dtype=object)
+    q_character = characters[uf["char_perm"][q_user, rng.integers(0, uf["n_unlocked"][q_user])]]
+    q_tier = choice(np.asarray(cfg.tiers), n_q)
+    q_qi = rng.integers(1, cfg.questions_per_tier + 1, size=n_q)
+    q_pos = np.arange(n_q)
+
+    # Rows are ordered like a per-session event log:
+    # session start/first open, then each question's events, then technical events.
+    blocks: list[dict[str, object]] = []
+
+    def add_block(event_name: str, sess, dt, sub, rank: int, params=(), **extra) -> None:
+        blocks.append({
+            "_session": sess,
+            "_sub": sub,
+            "_rank": rank,
+            "_dt": dt,
+            "event_name": event_name,
+            "event_params": _params_rows([
+                ("ga_session_id", ga_session_id[sess]),
+                ("ga_session_number", ga_session_number[sess]),
+                *params,
+            ]),
+            **extra,
+        })
 
-        # vocab-driven values
-        unlocked_characters = rng.choice(
-            cfg.vocab.characters,
-            size=min(len(cfg.vocab.characters), int(rng.integers(1, len(cfg.vocab.characters) + 1))),
-            replace=False,
-        )
+    def question_params(mask) -> list[tuple[str, object]]:
+        return [
+            ("character_name", q_character[mask]),
+            ("current_tier", q_tier[mask]),
+            ("current_qi", q_qi[mask]),
+        ]
+
+    all_sessions = np.arange(n_sessions)
+    add_block(
+        "session_start", all_sessions, session_start, -1, 0,
+        params=[
+            ("firebase_event_origin", "auto"),
+            ("session_engaged", choice(["0", "1"], n_sessions)),
+        ],
+    )
+
+    # first_open (once per user, in their first session)
+    add_block(
+        "first_open", first_session, first_open_ns, -1, 1,
+        params=[
+            ("pp_accepted", rng.random(n_users) < 0.85),
+            ("video_start", rng.random(n_users) < 0.75),
+            ("video_finished", rng.random(n_users) < 0.55),
+            ("previous_first_open_count", 0),
+        ],
+    )
+
+    everything = np.ones(n_q, dtype=bool)
+    add_block("question_started", q_session, dt_q, q_pos, 0, params=question_params(everything))
+    add_block(
+        "question_completed", q_session, dt_q + 3 * SECOND_NS, q_pos, 1,
+        params=[*question_params(everything), ("answered_wrong", rng.integers(0, 3, size=n_q))],
+    )
 
-        # sessions per user
-        sessions = int(max(1, rng.poisson(lam=max(cfg.avg_sessions_per_user, 0.1))))
-        for s in range(sessions):
-            ga_session_id = int(rng.integers(1_000_000_000, 9_999_999_999))
-            ga_session_number = int(s + 1)
-
-            session_day = int(rng.integers(first_open_day, cfg.days))
-            session_start = start + pd.Timedelta(days=session_day) + pd.Timedelta(minutes=int(rng.integers(0, 1440)))
-
-            def add_event(event_name: str, dt: pd.Timestamp, params: list[dict] | None = None, extra: dict | None = None):
-                nonlocal event_bundle_seq
-                ts_us = int(dt.value // 1_000)
-                prev_us = int((dt - pd.Timedelta(seconds=int(rng.integers(0, 60)))).value // 1_000)
-                base_params = [
-                    _param("ga_session_id", ga_session_id),
-                    _param("ga_session_number", ga_session_number),
-                ]
-                if params:
-                    base_params.extend(params)
-
-                row = {
-                    "event_date": dt.strftime("%Y%m%d"),
-                    "event_timestamp": ts_us,
-                    "event_name": event_name,
-                    "event_previous_timestamp": prev_us,
-                    "event_value_in_usd": None,
-                    "event_bundle_sequence_id": event_bundle_seq,
-                    "event_server_timestamp_offset": int(rng.integers(0, 5000)),
-                    "user_id": user_id,
-                    "user_pseudo_id": user_pseudo_id,
-                    "user_first_touch_timestamp": user_first_touch_ts_us,
-                    "stream_id": stream_id,
-                    "platform": platform,
-                    "is_active_user": is_active_user,
-                    "batch_event_index": int(rng.integers(1, 5)),
-                    "batch_page_id": None,
-                    "batch_ordering_id": None,
-
-                    "device": device,
-                    "geo": geo,
-                    "app_info": app_info,
-                    "traffic_source": traffic_source,
-                    "privacy_info": privacy_info,
-                    "user_ltv": {},
-
-                    "event_params": base_params,
-                    "user_properties": user_properties,
-                    "items": [],
-                    "item_params": [],
-                    "event_dimensions": {},
-                    "ecommerce": {},
-                    "collected_traffic_source": {},
-                }
-                if extra:
-                    row.update(extra)
-
-                rows.append(row)
-                event_bundle_seq += 1
-
-            # session_start event
-            add_event(
-                "session_start",
-                session_start,
-                params=[
-                    _param("firebase_event_origin", "auto"),
-                    _param("session_engaged", str(rng.choice(["0", "1"]))),
-                ],
-            )
-
-            # first_open (once per user, roughly)
-            if s == 0:
-                add_event(
-                    "first_open",
-                    first_open_dt,
-                    params=[
-                        _param("pp_accepted", rng.random() < 0.85),
-                        _param("video_start", rng.random() < 0.75),
-                        _param("video_finished", rng.random() < 0.55),
-                        _param("previous_first_open_count", 0),
-                    ],
-                )
-
-            # per-session gameplay events
-            n_questions = int(rng.integers(1, 8))
-            for _q in range(n_questions):
-                dt_q = session_start + pd.Timedelta(seconds=int(rng.integers(5, 400)))
-                character = str(rng.choice(unlocked_characters))
-                tier = int(rng.choice(cfg.tiers))
-                current_qi = int(rng.integers(1, cfg.questions_per_tier + 1))
-
-                add_event(
-                    "question_started",
-                    dt_q,
-                    params=[
-                        _param("character_name", character),
-                        _param("current_tier", tier),
-                        _param("current_qi", current_qi),
-                    ],
-                )
-
-                add_event(
-                    "question_completed",
-                    dt_q + pd.Timedelta(seconds=3),
-                    params=[
-                        _param("character_name", character),
-                        _param("current_tier", tier),
-                        _param("current_qi", current_qi),
-                        _param("answered_wrong", int(rng.integers(0, 3))),
-                    ],
-                )
-
-                # ad_rewarded
-                if rng.random() < 0.25:
-                    add_event(
-                        "ad_rewarded",
-                        dt_q + pd.Timedelta(seconds=2),
-                        params=[
-                            _param("ad_network", str(rng.choice(["admob", "unity", "ironSource"]))),
-                            _param("ad_unit_id", str(rng.choice(["rewarded_1", "rewarded_2"]))),
-                            _param("ad_instance", str(rng.choice(["instance_a", "instance_b"]))),
-                            _param("ad_id", _random_hex(rng, 12)),
-                            _param("character_name", character),
-                            _param("current_tier", tier),
-                            _param("current_qi", current_qi),
-                        ],
-                    )
-
-                # menu_opened scroll
-                if rng.random() < 0.15:
-                    add_event(
-                        "menu_opened",
-                        dt_q + pd.Timedelta(seconds=1),
-                        params=[
-                            _param("menu_name", cfg.vocab.scroll_menu_name),
-                            _param("character_name", character),
-                            _param("current_tier", tier),
-                            _param("current_qi", current_qi),
-                        ],
-                    )
-
-                # spend_virtual_currency (energy item usage)
-                if rng.random() < 0.18:
-                    spent_to = str(rng.choice([cfg.vocab.alicin_name, cfg.vocab.coffee_name, cfg.vocab.cauldron_name]))
-                    add_event(
-                        "spend_virtual_currency",
-                        dt_q + pd.Timedelta(seconds=4),
-                        params=[
-                            _param("currency_name", "Gold"),
-                            _param("spent_amount", float(int(rng.integers(10, 120)))),
-                            _param("where_its_spent", str(rng.choice(["board", "board_item", "shop"]))),
-                            _param("spent_to", spent_to),
-                            _param("character_name", character),
-                            _param("current_tier", tier),
-                            _param("current_qi", current_qi),
-                        ],
-                    )
-
-                # spend_virtual_currency (consumable)
-                if rng.random() < 0.10:
-                    cons = str(rng.choice([cfg.vocab.potion_name, cfg.vocab.incense_name, cfg.vocab.amulet_name]))
-                    add_event(
-                        "spend_virtual_currency",
-                        dt_q + pd.Timedelta(seconds=5),
-                        params=[
-                            _param("currency_name", "Gold"),
-                            _param("spent_amount", float(int(rng.integers(100, 500)))),
-                            _param("where_its_spent", "shop"),
-                            _param("spent_to", "Consumable Item"),
-                            _param("character_name", character),
-                            _param("current_tier", tier),
-                            _param("current_qi", current_qi),
-                        ],
-                        extra={"shop_consumable_item": cons},
-                    )
-
-            # occasional technical
-            if rng.random() < 0.03:
-                add_event(
-                    "ad_load_failed",
-                    session_start + pd.Timedelta(seconds=6),
-                    params=[
-                        _param("ad_error_code", str(rng.choice(["0", "1", "2", "timeout"]))),
-                        _param("ad_network", str(rng.choice(["admob", "unity"]))),
-                        _param("ad_instance", str(rng.choice(["instance_a", "instance_b"]))),
-                        _param("ad_id", _random_hex(rng, 12)),
-                    ],
-                )
-
-            if rng.random() < 0.01:
-                add_event(
-                    "app_exception",
-                    session_start + pd.Timedelta(seconds=7),
-                    params=[
-                        _param("fatal", rng.random() < 0.5),
-                        _param("firebase_error", "NullPointer"),
-                    ],
-                )
-
-            if rng.random() < 0.04:
-                add_event("app_remove", session_start + pd.Timedelta(minutes=5))
-
-    return pd.DataFrame(rows)
+    # ad_rewarded
+    m = rng.random(n_q) < 0.25
+    k = int(m.sum())
+    add_block(
+        "ad_rewarded", q_session[m], dt_q[m] + 2 * SECOND_NS, q_pos[m], 2,
+        params=[
+            ("ad_network", choice(["admob", "unity", "ironSource"], k)),
+            ("ad_unit_id", choice(["rewarded_1", "rewarded_2"], k)),
+            ("ad_instance", choice(["instance_a", "instance_b"], k)),
+            ("ad_id", _random_hex(rng, k, 12)),
+            *question_params(m),
+        ],
+    )
+
+    # menu_opened scroll
+    m = rng.random(n_q) < 0.15
+    add_block(
+        "menu_opened", q_session[m], dt_q[m] + 1 * SECOND_NS, q_pos[m], 3,
+        params=[("menu_name", cfg.vocab.scroll_menu_name), *question_params(m)],
+    )
+
+    # spend_virtual_currency (energy item usage)
+    m = rng.random(n_q) < 0.18
+    k = int(m.sum())
+    add_block(
+        "spend_virtual_currency", q_session[m], dt_q[m] + 4 * SECOND_NS, q_pos[m], 4,
+        params=[
+            ("currency_name", "Gold"),
+            ("spent_amount", rng.integers(10, 120, size=k).astype(float)),
+            ("where_its_spent", choice(["board", "board_item", "shop"], k)),
+            ("spent_to", choice(cfg.vocab.energy_items, k)),
+            *question_params(m),
+        ],
+    )
+
+    # spend_virtual_currency (consumable)
+    m = rng.random(n_q) < 0.10
+    k = int(m.sum())
+    add_block(
+        "spend_virtual_currency", q_session[m], dt_q[m] + 5 * SECOND_NS, q_pos[m], 5,
+        params=[
+            ("currency_name", "Gold"),
+            ("spent_amount", rng.integers(100, 500, size=k).astype(float)),
+            ("where_its_spent", "shop"),
+            ("spent_to", "Consumable Item"),
+            *question_params(m),
+        ],
+        shop_consumable_item=choice(cfg.vocab.consumable_items, k),
+    )
+
+    # occasional technical
+    s = np.flatnonzero(rng.random(n_sessions) < 0.03)
+    add_block(
+        "ad_load_failed", s, session_start[s] + 6 * SECOND_NS, n_q, 0,
+        params=[
+            ("ad_error_code", choice(["0", "1", "2", "timeout"], len(s))),
+            ("ad_network", choice(["admob", "unity"], len(s))),
+            ("ad_instance", choice(["instance_a", "instance_b"], len(s))),
+            ("ad_id", _random_hex(rng, len(s), 12)),
+        ],
+    )
+
+    s = np.flatnonzero(rng.random(n_sessions) < 0.01)
+    add_block(
+        "app_exception", s, session_start[s] + 7 * SECOND_NS, n_q, 1,
+        params=[
+            ("fatal", rng.random(len(s)) < 0.5),
+            ("firebase_error", "NullPointer"),
+        ],
+    )
+
+    s = np.flatnonzero(rng.random(n_sessions) < 0.04)
+    add_block("app_remove", s, session_start[s] + 5 * MINUTE_NS, n_q, 2)
+
+    ev = _concat_blocks(blocks)
+    ev = ev.iloc[np.lexsort((ev["_rank"].to_numpy(), ev["_sub"].to_numpy(), ev["_session"].to_numpy()))]
+
+    n = len(ev)
+    user = session_user[ev["_session"].to_numpy()]
+    ts_ns = ev["_dt"].to_numpy(dtype="int64")
+    ts_us = ts_ns // 1_000
+    # format each distinct day once instead of every row
+    days, day_idx = np.unique(ts_ns // DAY_NS, return_inverse=True)
+    event_date = pd.to_datetime(days * DAY_NS, unit="ns").strftime("%Y%m%d").to_numpy(dtype=object)[day_idx]
+    prev_us = ts_us - rng.integers(0, 60, size=n) * 1_000_000
+
+    shop_consumable_item = ev["shop_consumable_item"].to_numpy(dtype=object) if "shop_consumable_item" in ev else np.full(n, None)
+
+    return pd.DataFrame({
+        "event_date": event_date,
+        "event_timestamp": ts_us,
+        "event_name": ev["event_name"].to_numpy(dtype=object),
+        "event_previous_timestamp": prev_us,
+        "event_value_in_usd": np.full(n, None),
+        "event_bundle_sequence_id": np.arange(1, n + 1),
+        "event_server_timestamp_offset": rng.integers(0, 5000, size=n),
+        "user_id": np.full(n, None),
+        "user_pseudo_id": user_pseudo_id[user],
+        "user_first_touch_timestamp": user_first_touch_ts_us[user],
+        "stream_id": stream_id[user],
+        "platform": platform[user],
+        "is_active_user": np.ones(n, dtype=bool),
+        "batch_event_index": rng.integers(1, 5, size=n),
+        "batch_page_id": np.full(n, None),
+        "batch_ordering_id": np.full(n, None),
+
+        "device": _object_array(device)[user],
+        "geo": _object_array(geo)[user],
+        "app_info": _object_array(app_info)[user],
+        "traffic_source": _object_array(traffic_source)[user],
+        "privacy_info": _object_array(privacy_info)[user],
+        "user_ltv": [{} for _ in range(n)],
+
+        "event_params": ev["event_params"].to_numpy(dtype=object),
+        "user_properties": _object_array(user_properties)[user],
+        "items": [[] for _ in range(n)],
+        "item_params": [[] for _ in range(n)],
+        "event_dimensions": [{} for _ in range(n)],
+        "ecommerce": [{} for _ in range(n)],
+        "collected_traffic_source": [{} for _ in range(n)],
+        "shop_consumable_item": shop_consumable_item,
+    })
+
+
+def _session_bounds(session_id: np.ndarray, ts: np.ndarray) -> tuple[pd.DatetimeIndex, pd.DatetimeIndex]:
+    """Per-row first/last event time of the row's session (NaT for rows without a session).
+
+    Session ids are unique across users here, so rows are grouped by id alone: one stable
+    argsort makes each session a contiguous segment, reduced with np.minimum/maximum.reduceat
+    and broadcast back with np.repeat.
+    """
+    first = np.full(len(ts), np.datetime64("NaT"), dtype="datetime64[ns]")
+    last = first.copy()
+
+    rows = np.flatnonzero(~np.isnan(session_id))
+    if len(rows):
+        order = rows[np.argsort(session_id[rows], kind="stable")]
+        sid = session_id[order]
+        starts = np.flatnonzero(np.r_[True, sid[1:] != sid[:-1]])
+        lengths = np.diff(np.r_[starts, len(order)])
+        first[order] = np.repeat(np.minimum.reduceat(ts[order], starts), lengths)
+        last[order] = np.repeat(np.maximum.reduceat(ts[order], starts), lengths)
+
+    return pd.DatetimeIndex(first, tz="UTC"), pd.DatetimeIndex(last, tz="UTC")
+
+
+def _question_address(df: pd.DataFrame) -> pd.Series:
+    """"<character> - T: <tier> - Q: <index>" per row; NA unless all three parts are present."""
+    c = df["event_params__character_name"]
+    t = df["event_params__current_tier"]
+    q = df["event_params__current_question_index"]
+    m = c.notna() & t.notna() & q.notna()
+    addr = c[m].astype(str) + " - T: " + t[m].astype("int64").astype(str) + " - Q: " + q[m].astype("int64").astype(str)
+    return addr.reindex(df.index)
 
 
 def _build_events(cfg: MockConfig) -> pd.DataFrame:
     rng = np.random.default_rng(cfg.seed)
+    v = cfg.vocab
 
-    start = pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=cfg.days - 1)
-    start = start.tz_localize("UTC") if start.tzinfo is None else start.tz_convert("UTC")
-
-    rows: list[dict] = []
-
-    session_id_counter = 10_000
-    for _ in range(cfg.users):
-        user_id = _random_hex(rng, 32)
-        country = rng.choice(cfg.countries)
-        os_name = rng.choice(cfg.operating_systems)
-        start_version = rng.choice(cfg.app_versions)
-
-        # sessions per user (at least 1)
-        sessions = int(max(1, rng.poisson(lam=max(cfg.avg_sessions_per_user, 0.1))))
-
-        # Conversion-like booleans at user-level
-        pp_ok = rng.random() < 0.85
-        video_start = rng.random() < 0.75
-        video_finished = video_start and (rng.random() < 0.7)
-
-        tutorial_completed = rng.random() < 0.55
-
-        first_open_day = int(rng.integers(0, cfg.days))
-        first_open_dt = start + pd.Timedelta(days=first_open_day) + pd.Timedelta(minutes=int(rng.integers(0, 1200)))
-
-        rows.append({
-            "event_name": "First Open",
-            "event_datetime": first_open_dt,
-            "user_pseudo_id": user_id,
-            "event_params__ga_session_id": None,
-            "app_info__version": start_version,
-            "geo__country": country,
-            "device__operating_system": os_name,
-            "event_params__pp_accepted": "true" if pp_ok else "false",
-            "event_params__video_start": "true" if video_start else "false",
-            "event_params__video_finished": "true" if video_finished else "false",
-            "event_params__tutorial_video": "tutorial_video" if tutorial_completed else None,
+    start_ns = _start_ns(cfg)
+
+    def choice(values, size: int) -> np.ndarray:
+        table = values if isinstance(values, np.ndarray) else np.asarray(values, dtype=object)
+        return table[rng.integers(0, len(table), size=size)]
+
+    # --- users -------------------------------------------------------------
+    n_users = cfg.users
+    uf = _draw_user_fields(cfg, rng)
+    app_versions = np.asarray(cfg.app_versions, dtype=object)
+    user_id = _random_hex(rng, n_users)
+    country = choice(cfg.countries, n_users)
+    os_name = choice(cfg.operating_systems, n_users)
+
+    # Conversion-like booleans at user-level
+    pp_ok = rng.random(n_users) < 0.85
+    video_start = rng.random(n_users) < 0.75
+    video_finished = video_start & (rng.random(n_users) < 0.7)
+    tutorial_completed = rng.random(n_users) < 0.55
+
+    first_open_ns = start_ns + uf["first_open_day"] * DAY_NS + rng.integers(0, 1200, size=n_users) * MINUTE_NS
+
+    # --- sessions ----------------------------------------------------------
+    session_user = uf["session_user"]
+    n_sessions = len(session_user)
+    session_id = 10_001 + np.arange(n_sessions)
+
+    session_start = start_ns + uf["session_day"] * DAY_NS + rng.integers(0, 1440, size=n_sessions) * MINUTE_NS
+    session_seconds = rng.integers(30, 900, size=n_sessions)
+    session_end = session_start + session_seconds * SECOND_NS
+
+    # --- questions ---------------------------------------------------------
+    q_session = np.repeat(np.arange(n_sessions), rng.integers(1, 8, size=n_sessions))
+    n_q = len(q_session)
+    q_user = session_user[q_session]
+    event_t = session_start[q_session] + rng.integers(5, np.maximum(10, session_seconds)[q_session]) * SECOND_NS
+    # Each user's characters: a random prefix of their own permutation
+    characters = np.asarray(v.characters, dtype=object)
+    q_character = characters[uf["char_perm"][q_user, rng.integers(0, uf["n_unlocked"][q_user])]]
+    q_tier = choice(np.asarray(cfg.tiers), n_q)
+    q_qi = rng.integers(1, cfg.questions_per_tier + 1, size=n_q)
+
+    blocks: list[dict[str, object]] = []
+
+    def add_block(event_name: str, sess, dt, **cols) -> None:
+        blocks.append({
+            "event_name": event_name,
+            "event_datetime": dt,
+            "_user": session_user[sess],
+            "event_params__ga_session_id": session_id[sess],
+            "app_info__version": choice(app_versions, len(sess)),
+            **cols,
         })
 
-        # Give each user a character progression set
-        unlocked_characters = rng.choice(cfg.vocab.characters, size=min(len(cfg.vocab.characters), int(rng.integers(1, len(cfg.vocab.characters) + 1))), replace=False)
-
-        for _s in range(sessions):
-            session_id_counter += 1
-            session_id = session_id_counter
-
-            session_day = int(rng.integers(first_open_day, cfg.days))
-            session_start = start + pd.Timedelta(days=session_day) + pd.Timedelta(minutes=int(rng.integers(0, 1440)))
-            session_end = session_start + pd.Timedelta(seconds=int(rng.integers(30, 900)))
-
-            # Session start
-            rows.append({
-                "event_name": "Session Started",
-                "event_datetime": session_start,
-                "user_pseudo_id": user_id,
-                "event_params__ga_session_id": session_id,
-                "app_info__version": rng.choice(cfg.app_versions),
-                "geo__country": country,
-                "device__operating_system": os_name,
-                "event_params__entered": "true" if (rng.random() < 0.6) else "false",
-                "event_params__shown": "true" if (rng.random() < 0.5) else "false",
-                "event_params__opened": "true" if (rng.random() < 0.4) else "false",
-                "event_params__return": "true" if (rng.random() < 0.25) else "false",
-                "event_params__closed": "true" if (rng.random() < 0.35) else "false",
-                "event_params__drag": "true" if (rng.random() < 0.45) else "false",
-            })
-
-            # starting currencies
-            rows.append({
-                "event_name": "Starting Currencies",
-                "event_datetime": session_start + pd.Timedelta(seconds=1),
-                "user_pseudo_id": user_id,
-                "event_params__ga_session_id": session_id,
-                "geo__country": country,
-                "device__operating_system": os_name,
-                "app_info__version": rng.choice(cfg.app_versions),
-                "event_params__gold": float(int(rng.integers(0, 1200))),
-            })
-
-            # question loop
-            n_questions = int(rng.integers(1, 8))
-            for q in range(n_questions):
-                event_t = session_start + pd.Timedelta(seconds=int(rng.integers(5, max(10, int((session_end - session_start).total_seconds())))))
-                character = str(rng.choice(unlocked_characters))
-                tier = int(rng.choice(cfg.tiers))
-                qi = int(rng.integers(1, cfg.questions_per_tier + 1))
-
-                rows.append({
-                    "event_name": "Question Started",
-                    "event_datetime": event_t,
-                    "user_pseudo_id": user_id,
-                    "event_params__ga_session_id": session_id,
-                    "geo__country": country,
-                    "device__operating_system": os_name,
-                    "app_info__version": rng.choice(cfg.app_versions),
-                    "event_params__character_name": character,
-                    "event_params__current_tier": tier,
-                    "event_params__current_question_index": qi,
-                })
-
-                rows.append({
-                    "event_name": "Question Completed",
-                    "event_datetime": event_t + pd.Timedelta(seconds=3),
-                    "user_pseudo_id": user_id,
-                    "event_params__ga_session_id": session_id,
-                    "geo__country": country,
-                    "device__operating_system": os_name,
-                    "app_info__version": rng.choice(cfg.app_versions),
-                    "event_params__character_name": character,
-                    "event_params__current_tier": tier,
-                    "event_params__current_question_index": qi,
-                    "event_params__answered_wrong": int(rng.integers(0, 3)),
-                })
-
-                # optional ad rewarded
-                if rng.random() < 0.25:
-                    rows.append({
-                        "event_name": "Ad Rewarded",
-                        "event_datetime": event_t + pd.Timedelta(seconds=2),
-                        "user_pseudo_id": user_id,
-                        "event_params__ga_session_id": session_id,
-                        "geo__country": country,
-                        "device__operating_system": os_name,
-                        "app_info__version": rng.choice(cfg.app_versions),
-                        "event_params__character_name": character,
-                        "event_params__current_tier": tier,
-                        "event_params__current_question_index": qi,
-                        "event_params__ad_network": str(rng.choice(["admob", "unity", "ironSource", None])),
-                        "event_params__ad_unit_id": str(rng.choice(["rewarded_1", "rewarded_2", None])),
-                        "event_params__ad_instance": str(rng.choice(["instance_a", "instance_b", None])),
-                        "event_params__ad_id": _random_hex(rng, 12),
-                    })
-
-                # optional scroll menu
-                if rng.random() < 0.15:
-                    rows.append({
-                        "event_name": "Menu Opened",
-                        "event_datetime": event_t + pd.Timedelta(seconds=1),
-                        "user_pseudo_id": user_id,
-                        "event_params__ga_session_id": session_id,
-                        "geo__country": country,
-                        "device__operating_system": os_name,
-                        "app_info__version": rng.choice(cfg.app_versions),
-                        "event_params__menu_name": cfg.vocab.scroll_menu_name,
-                        "event_params__character_name": character,
-                        "event_params__current_tier": tier,
-                        "event_params__current_question_index": qi,
-                    })
-
-                # optional energy item usage (spent_to)
-                if rng.random() < 0.18:
-                    spent_to = rng.choice([
-                        cfg.vocab.alicin_name,
-                        cfg.vocab.coffee_name,
-                        cfg.vocab.cauldron_name,
-                    ])
-                    rows.append({
-                        "event_name": "Spent Virtual Currency",
-                        "event_datetime": event_t + pd.Timedelta(seconds=4),
-                        "user_pseudo_id": user_id,
-                        "event_params__ga_session_id": session_id,
-                        "geo__country": country,
-                        "device__operating_system": os_name,
-                        "app_info__version": rng.choice(cfg.app_versions),
-                        "event_params__currency_name": "Gold",
-                        "event_params__spent_amount": float(int(rng.integers(10, 120))),
-                        "event_params__where_its_spent": str(rng.choice(["board", "board_item", "shop"])) ,
-                        "event_params__spent_to": spent_to,
-                        "event_params__character_name": character,
-                        "event_params__current_tier": tier,
-                        "event_params__current_question_index": qi,
-                    })
-
-                # optional consumable purchase
-                if rng.random() < 0.10:
-                    cons = rng.choice([cfg.vocab.potion_name, cfg.vocab.incense_name, cfg.vocab.amulet_name])
-                    rows.append({
-                        "event_name": "Spent Virtual Currency",
-                        "event_datetime": event_t + pd.Timedelta(seconds=5),
-                        "user_pseudo_id": user_id,
-                        "event_params__ga_session_id": session_id,
-                        "geo__country": country,
-                        "device__operating_system": os_name,
-                        "app_info__version": rng.choice(cfg.app_versions),
-                        "event_params__currency_name": "Gold",
-                        "event_params__spent_amount": float(int(rng.integers(100, 500))),
-                        "event_params__where_its_spent": "shop",
-                        "event_params__spent_to": "Consumable Item",
-                        "shop_consumable_item": cons,
-                        "event_params__character_name": character,
-                        "event_params__current_tier": tier,
-                        "event_params__current_question_index": qi,
-                    })
-
-            # wheel interactions
-            if rng.random() < 0.25:
-                rows.append({
-                    "event_name": "Mini-game Started",
-                    "event_datetime": session_start + pd.Timedelta(seconds=2),
-                    "user_pseudo_id": user_id,
-                    "event_params__ga_session_id": session_id,
-                    "geo__country": country,
-                    "device__operating_system": os_name,
-                    "app_info__version": rng.choice(cfg.app_versions),
-                    "event_params__mini_game_ri": cfg.vocab.wheel_impression_ri,
-                })
-                if rng.random() < 0.3:
-                    rows.append({
-                        "event_name": "Mini-game Completed",
-                        "event_datetime": session_start + pd.Timedelta(seconds=3),
-                        "user_pseudo_id": user_id,
-                        "event_params__ga_session_id": session_id,
-                        "geo__country": country,
-                        "device__operating_system": os_name,
-                        "app_info__version": rng.choice(cfg.app_versions),
-                        "event_params__mini_game_ri": cfg.vocab.wheel_skip_ri,
-                    })
-
-            # technical noise
-            if rng.random() < 0.03:
-                rows.append({
-                    "event_name": "Ad Load Failed",
-                    "event_datetime": session_start + pd.Timedelta(seconds=6),
-                    "user_pseudo_id": user_id,
-                    "event_params__ga_session_id": session_id,
-                    "geo__country": country,
-                    "device__operating_system": os_name,
-                    "app_info__version": rng.choice(cfg.app_versions),
-                    "device__mobile_marketing_name": str(rng.choice(["Pixel", "iPhone", "Galaxy"])) ,
-                    "device__operating_system_version": str(rng.choice(["16", "17", "18", "Android 15"])) ,
-                    "event_params__ad_error_code": str(rng.choice(["0", "1", "2", "timeout"])) ,
-                    "event_server_delay_seconds": float(rng.random() * 2),
-                })
-
-            if rng.random() < 0.01:
-                rows.append({
-                    "event_name": "App Exception",
-                    "event_datetime": session_start + pd.Timedelta(seconds=7),
-                    "user_pseudo_id": user_id,
-                    "event_params__ga_session_id": session_id,
-                    "geo__country": country,
-                    "device__operating_system": os_name,
-                    "app_info__version": rng.choice(cfg.app_versions),
-                    "device__mobile_marketing_name": str(rng.choice(["Pixel", "iPhone", "Galaxy"])) ,
-                    "device__operating_system_version": str(rng.choice(["16", "17", "18", "Android 15"])) ,
-                    "event_server_delay_seconds": float(rng.random() * 5),
-                })
-
-            # optional game ended / uninstall
-            if rng.random() < 0.15:
-                rows.append({
-                    "event_name": "Game Ended",
-                    "event_datetime": session_end - pd.Timedelta(seconds=3),
-                    "user_pseudo_id": user_id,
-                    "event_params__ga_session_id": session_id,
-                    "geo__country": country,
-                    "device__operating_system": os_name,
-                    "app_info__version": rng.choice(cfg.app_versions),
-                })
-
-            if rng.random() < 0.04:
-                rows.append({
-                    "event_name": "App Removed",
-                    "event_datetime": session_end,
-                    "user_pseudo_id": user_id,
-                    "event_params__ga_session_id": session_id,
-                    "geo__country": country,
-                    "device__operating_system": os_name,
-                    "app_info__version": rng.choice(cfg.app_versions),
-                })
-
-    df = pd.DataFrame(rows)
+    def question_cols(mask) -> dict[str, np.ndarray]:
+        return {
+            "event_params__character_name": q_character[mask],
+            "event_params__current_tier": q_tier[mask],
+            "event_params__current_question_index": q_qi[mask],
+        }
+
+    blocks.append({
+        "event_name": "First Open",
+        "event_datetime": first_open_ns,
+        "_user": np.arange(n_users),
+        "event_params__ga_session_id": np.full(n_users, np.nan),
+        "app_info__version": choice(app_versions, n_users),
+        "event_params__pp_accepted": _bool_str(pp_ok),
+        "event_params__video_start": _bool_str(video_start),
+        "event_params__video_finished": _bool_str(video_finished),
+        "event_params__tutorial_video": np.where(tutorial_completed, "tutorial_video", None),
+    })
+
+    all_sessions = np.arange(n_sessions)
+    add_block(
+        "Session Started", all_sessions, session_start,
+        event_params__entered=_bool_str(rng.random(n_sessions) < 0.6),
+        event_params__shown=_bool_str(rng.random(n_sessions) < 0.5),
+        event_params__opened=_bool_str(rng.random(n_sessions) < 0.4),
+        event_params__return=_bool_str(rng.random(n_sessions) < 0.25),
+        event_params__closed=_bool_str(rng.random(n_sessions) < 0.35),
+        event_params__drag=_bool_str(rng.random(n_sessions) < 0.45),
+    )
+
+    # starting currencies
+    add_block(
+        "Starting Currencies", all_sessions, session_start + 1 * SECOND_NS,
+        event_params__gold=rng.integers(0, 1200, size=n_sessions).astype(float),
+    )
+
+    # question loop
+    everything = np.ones(n_q, dtype=bool)
+    add_block("Question Started", q_session, event_t, **question_cols(everything))
+    add_block(
+        "Question Completed", q_session, event_t + 3 * SECOND_NS,
+        **question_cols(everything),
+        event_params__answered_wrong=rng.integers(0, 3, size=n_q),
+    )
+
+    # optional ad rewarded
+    m = rng.random(n_q) < 0.25
+    k = int(m.sum())
+    add_block(
+        "Ad Rewarded", q_session[m], event_t[m] + 2 * SECOND_NS,
+        **question_cols(m),
+        event_params__ad_network=choice(["admob", "unity", "ironSource", "None"], k),
+        event_params__ad_unit_id=choice(["rewarded_1", "rewarded_2", "None"], k),
+        event_params__ad_instance=choice(["instance_a", "instance_b", "None"], k),
+        event_params__ad_id=_random_hex(rng, k, 12),
+    )
+
+    # optional scroll menu
+    m = rng.random(n_q) < 0.15
+    add_block(
+        "Menu Opened", q_session[m], event_t[m] + 1 * SECOND_NS,
+        event_params__menu_name=v.scroll_menu_name,
+        **question_cols(m),
+    )
+
+    # optional energy item usage (spent_to)
+    m = rng.random(n_q) < 0.18
+    k = int(m.sum())
+    add_block(
+        "Spent Virtual Currency", q_session[m], event_t[m] + 4 * SECOND_NS,
+        event_params__currency_name="Gold",
+        event_params__spent_amount=rng.integers(10, 120, size=k).astype(float),
+        event_params__where_its_spent=choice(["board", "board_item", "shop"], k),
+        event_params__spent_to=choice(v.energy_items, k),
+        **question_cols(m),
+    )
+
+    # optional consumable purchase
+    m = rng.random(n_q) < 0.10
+    k = int(m.sum())
+    add_block(
+        "Spent Virtual Currency", q_session[m], event_t[m] + 5 * SECOND_NS,
+        event_params__currency_name="Gold",
+        event_params__spent_amount=rng.integers(100, 500, size=k).astype(float),
+        event_params__where_its_spent="shop",
+        event_params__spent_to="Consumable Item",
+        shop_consumable_item=choice(v.consumable_items, k),
+        **question_cols(m),
+    )
+
+    # wheel interactions
+    wheel = rng.random(n_sessions) < 0.25
+    s = np.flatnonzero(wheel)
+    add_block(
+        "Mini-game Started", s, session_start[s] + 2 * SECOND_NS,
+        event_params__mini_game_ri=v.wheel_impression_ri,
+    )
+    s = np.flatnonzero(wheel & (rng.random(n_sessions) < 0.3))
+    add_block(
+        "Mini-game Completed", s, session_start[s] + 3 * SECOND_NS,
+        event_params__mini_game_ri=v.wheel_skip_ri,
+    )
+
+    # technical noise
+    s = np.flatnonzero(rng.random(n_sessions) < 0.03)
+    add_block(
+        "Ad Load Failed", s, session_start[s] + 6 * SECOND_NS,
+        device__mobile_marketing_name=choice(["Pixel", "iPhone", "Galaxy"], len(s)),
+        device__operating_system_version=choice(["16", "17", "18", "Android 15"], len(s)),
+        event_params__ad_error_code=choice(["0", "1", "2", "timeout"], len(s)),
+        event_server_delay_seconds=rng.random(len(s)) * 2,
+    )
+
+    s = np.flatnonzero(rng.random(n_sessions) < 0.01)
+    add_block(
+        "App Exception", s, session_start[s] + 7 * SECOND_NS,
+        device__mobile_marketing_name=choice(["Pixel", "iPhone", "Galaxy"], len(s)),
+        device__operating_system_version=choice(["16", "17", "18", "Android 15"], len(s)),
+        event_server_delay_seconds=rng.random(len(s)) * 5,
+    )
+
+    # optional game ended / uninstall
+    s = np.flatnonzero(rng.random(n_sessions) < 0.15)
+    add_block("Game Ended", s, session_end[s] - 3 * SECOND_NS)
+
+    s = np.flatnonzero(rng.random(n_sessions) < 0.04)
+    add_block("App Removed", s, session_end[s])
+
+    df = _concat_blocks(blocks)
+
+    # Order by (user_pseudo_id, event time) with one lexsort over int keys: each user's
+    # code is the rank of their id string, so this matches sorting by the strings.
+    _, user_code = np.unique(user_id, return_inverse=True)
+    user = df.pop("_user").to_numpy()
+    order = np.lexsort((df["event_datetime"].to_numpy(dtype="int64"), user_code[user]))
+    df = df.take(order).reset_index(drop=True)
+    user = user[order]
+
+    # user-level columns are gathered once from the per-user arrays
+    df.insert(2, "user_pseudo_id", user_id[user])
+    df.insert(5, "geo__country", country[user])
+    df.insert(6, "device__operating_system", os_name[user])
 
     # timestamps + date/time features
-    df["event_datetime"] = pd.to_datetime(df["event_datetime"], utc=True)
-    df = df.sort_values(["user_pseudo_id", "event_datetime"]).reset_index(drop=True)
-    # microseconds since epoch
-    df["event_timestamp"] = (df["event_datetime"].astype("int64") // 1_000).astype("int64")
+    df["event_datetime"] = pd.to_datetime(df["event_datetime"], unit="ns", utc=True)
+    # microseconds since epoch (explicit unit; the column may be ns- or us-backed)
+    df["event_timestamp"] = df["event_datetime"].dt.as_unit("us").astype("int64")
 
     df["event_date"] = df["event_datetime"].dt.normalize()
-    df["event_time"] = df["event_datetime"].dt.time
-
-    df["ts_weekday"] = df["event_datetime"].dt.weekday.map(TURKISH_WEEKDAYS)
+    # "HH:MM:SS" from int64 seconds-of-day, formatting each distinct second once
+    # (event times are whole seconds, so this matches str(datetime.time))
+    sod = (df["event_datetime"].to_numpy(dtype="datetime64[ns]").view("int64") // SECOND_NS) % 86400
+    sod_uniq, sod_idx = np.unique(sod, return_inverse=True)
+    df["event_time"] = np.array(
+        [f"{x // 3600:02d}:{x // 60 % 60:02d}:{x % 60:02d}" for x in sod_uniq.tolist()], dtype=object
+    )[sod_idx]
+
+    weekday = df["event_datetime"].dt.weekday.to_numpy()
+    # small fixed label sets: keep them as categoricals built straight from the int codes
+    df["ts_weekday"] = pd.Categorical.from_codes(weekday, TURKISH_WEEKDAYS_ARR)
     df["ts_hour"] = df["event_datetime"].dt.hour
-    df["ts_daytime_named"] = df["ts_hour"].apply(_daytime_named)
-    df["ts_is_weekend"] = df["event_datetime"].dt.weekday.apply(_is_weekend)
+    daytime = np.searchsorted(DAYTIME_BINS, df["ts_hour"].to_numpy(), side="right") - 1
+    df["ts_daytime_named"] = pd.Categorical.from_codes(daytime, DAYTIME_NAMES)
+    df["ts_is_weekend"] = pd.Categorical.from_codes((weekday >= 5).astype(np.int8), WEEKEND_NAMES)
 
     # session features
-    session_groups = ["user_pseudo_id", "event_params__ga_session_id"]
-    df["session_start_time"] = df.groupby(session_groups)["event_datetime"].transform("min")
-    df["session_end_time"] = df.groupby(session_groups)["event_datetime"].transform("max")
-    df["session_duration_seconds"] = (
-        (df["session_end_time"] - df["session_start_time"]).dt.total_seconds().fillna(0)
+    first, last = _session_bounds(
+        df["event_params__ga_session_id"].to_numpy(dtype="float64"),
+        df["event_datetime"].to_numpy(dtype="datetime64[ns]"),
     )
+    df["session_start_time"], df["session_end_time"] = first, last
+    # straight from the int64 ns values; rows without a session (NaT) get 0
+    duration_ns = last.asi8 - first.asi8
+    df["session_duration_seconds"] = np.where(first.isna(), 0.0, duration_ns / SECOND_NS)
     df["session_duration_minutes"] = df["session_duration_seconds"] / 60
 
     # question address
-    def _qa(row):
-        c = row.get("event_params__character_name")
-        t = row.get("event_params__current_tier")
-        q = row.get("event_params__current_question_index")
-        if pd.isna(c) or pd.isna(t) or pd.isna(q):
-            return pd.NA
-        return f"{c} - T: {int(t)} - Q: {int(q)}"
-
-    df["question_address"] = df.apply(_qa, axis=1)
+    df["question_address"] = _question_address(df)
 
     # cumulative question index (mirrors feature_engineering.py intent)
     qi = pd.to_numeric(df.get("event_params__current_question_index"), errors="coerce")
     tier = pd.to_numeric(df.get("event_params__current_tier"), errors="coerce")
     char = df.get("event_params__character_name")
-    df["cumulative_question_index"] = qi
 
-    # offsets by tier, special vs non-special character
+    # offsets by tier, special vs non-special character, in one table gather;
+    # tier 1 and missing/unknown tiers get offset 0 (qi unchanged)
     special = cfg.vocab.special_character_for_offsets
-    is_special = char.astype(str) == str(special)
-
-    # tier 2
-    df.loc[(tier == 2) & is_special, "cumulative_question_index"] = qi + 12
-    df.loc[(tier == 2) & (~is_special), "cumulative_question_index"] = qi + 16
-    # tier 3
-    df.loc[(tier == 3) & is_special, "cumulative_question_index"] = qi + 24
-    df.loc[(tier == 3) & (~is_special), "cumulative_question_index"] = qi + 28
-    # tier 4
-    df.loc[(tier == 4) & is_special, "cumulative_question_index"] = qi + 36
-    df.loc[(tier == 4) & (~is_special), "cumulative_question_index"] = qi + 40
+    is_special = (char.astype(str) == str(special)).to_numpy()
+    tier_arr = tier.to_numpy(dtype="float64")
+    known = np.isin(tier_arr, np.arange(len(TIER_OFFSETS)))
+    tier_idx = np.where(known, tier_arr, 0).astype(np.intp)
+    df["cumulative_question_index"] = qi + TIER_OFFSETS[tier_idx, is_special.astype(np.intp)]
 
     return df
 
 
-def _safe_ratio(numer: pd.Series, denom: pd.Series) -> pd.Series:
-    numer_f = pd.to_numeric(numer, errors="coerce").astype("float64")
-    denom_f = pd.to_numeric(denom, errors="coerce").astype("float64")
-    denom_f = denom_f.mask(denom_f == 0)
-    return (numer_f / denom_f).fillna(0).round(3)
+def _safe_ratio(numer: pd.Series | pd.DataFrame, denom: pd.Series) -> pd.Series | pd.DataFrame:
+    """numer / denom rounded to 3 places; 0 where denom is 0 or either side is missing.
+
+    A DataFrame `numer` has every column divided by `denom` in one broadcast divide.
+    """
+    if isinstance(numer, pd.DataFrame):
+        n = numer.apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")
+        d = pd.to_numeric(denom, errors="coerce").to_numpy(dtype="float64")[:, None]
+    else:
+        n = pd.to_numeric(numer, errors="coerce").to_numpy(dtype="float64")
+        d = pd.to_numeric(denom, errors="coerce").to_numpy(dtype="float64")
+    ratio = np.divide(n, d, out=np.zeros_like(n), where=(d != 0) & ~np.isnan(d) & ~np.isnan(n))
+    if isinstance(numer, pd.DataFrame):
+        return pd.DataFrame(ratio.round(3), index=numer.index, columns=numer.columns)
+    return pd.Series(ratio.round(3), index=numer.index)
 
 
 def _df_by_questions(cfg: MockConfig, df: pd.DataFrame) -> pd.DataFrame:
@@ -710,31 +950,48 @@ def _df_by_questions(cfg: MockConfig, df: pd.DataFrame) -> pd.DataFrame:
     base = df[gcols].copy()
 
     v = cfg.vocab
-    temp = pd.DataFrame({
-        "question_started": df["event_name"].eq("Question Started").astype(int),
-        "potions_bought": df.get("shop_consumable_item").eq(v.potion_name).fillna(False).astype(int),
-        "incense_bought": df.get("shop_consumable_item").eq(v.incense_name).fillna(False).astype(int),
-        "amulet_bought": df.get("shop_consumable_item").eq(v.amulet_name).fillna(False).astype(int),
-        "alicin_used": df.get("event_params__spent_to").eq(v.alicin_name).fillna(False).astype(int),
-        "coffee_used": df.get("event_params__spent_to").eq(v.coffee_name).fillna(False).astype(int),
-        "cauldron_used": df.get("event_params__spent_to").eq(v.cauldron_name).fillna(False).astype(int),
-        "scroll_opened": (
-            df["event_name"].eq("Menu Opened") & df.get("event_params__menu_name").eq(v.scroll_menu_name)
-        ).fillna(False).astype(int),
-        "answered_correct": df["event_name"].eq("Question Completed").astype(int),
-        "answered_wrong": pd.to_numeric(df.get("event_params__answered_wrong"), errors="coerce").fillna(0),
-        "ads_watched": df["event_name"].eq("Ad Rewarded").astype(int),
-    })
+    name = df["event_name"]
+    item = df.get("shop_consumable_item")
+    spent_to = df.get("event_params__spent_to")
+
+    # 0/1 indicators as one int8 block. groupby.sum() hands the totals back as int8 while
+    # they all fit and wider otherwise, so they are cast to int64 below.
+    flags = {
+        "question_started": name.eq("Question Started"),
+        "potions_bought": item.eq(v.potion_name),
+        "incense_bought": item.eq(v.incense_name),
+        "amulet_bought": item.eq(v.amulet_name),
+        "alicin_used": spent_to.eq(v.alicin_name),
+        "coffee_used": spent_to.eq(v.coffee_name),
+        "cauldron_used": spent_to.eq(v.cauldron_name),
+        "scroll_opened": name.eq("Menu Opened") & df.get("event_params__menu_name").eq(v.scroll_menu_name),
+        "answered_correct": name.eq("Question Completed"),
+        "ads_watched": name.eq("Ad Rewarded"),
+    }
+    temp = pd.DataFrame(
+        np.column_stack([m.fillna(False).to_numpy(dtype=np.int8) for m in flags.values()]),
+        columns=list(flags),
+    )
+    temp.insert(
+        temp.columns.get_loc("answered_correct") + 1,
+        "answered_wrong",
+        pd.to_numeric(df.get("event_params__answered_wrong"), errors="coerce").fillna(0).to_numpy(),
+    )
 
     qdf = pd.concat([base.reset_index(drop=True), temp.reset_index(drop=True)], axis=1)
     qdf = qdf.groupby(gcols, as_index=False).sum()
-
-    qdf["wrong_answer_ratio"] = _safe_ratio(qdf["answered_wrong"], qdf["question_started"])
-    qdf["ads_watch_ratio"] = _safe_ratio(qdf["ads_watched"], qdf["question_started"])
-    qdf["alicin_use_ratio"] = _safe_ratio(qdf["alicin_used"], qdf["question_started"])
-    qdf["coffee_use_ratio"] = _safe_ratio(qdf["coffee_used"], qdf["question_started"])
-    qdf["cauldron_use_ratio"] = _safe_ratio(qdf["cauldron_used"], qdf["question_started"])
-    qdf["scroll_use_ratio"] = _safe_ratio(qdf["scroll_opened"], qdf["question_started"])
+    qdf[list(flags)] = qdf[list(flags)].astype("int64")
+
+    # every ratio shares the question_started denominator: one divide over the numerator block
+    ratio_of = {
+        "wrong_answer_ratio": "answered_wrong",
+        "ads_watch_ratio": "ads_watched",
+        "alicin_use_ratio": "alicin_used",
+        "coffee_use_ratio": "coffee_used",
+        "cauldron_use_ratio": "cauldron_used",
+        "scroll_use_ratio": "scroll_opened",
+    }
+    qdf[list(ratio_of)] = _safe_ratio(qdf[list(ratio_of.values())], qdf["question_started"]).to_numpy()
 
     return qdf
 
@@ -797,9 +1054,12 @@ def _df_technical_events(df: pd.DataFrame) -> pd.DataFrame:
         if c not in df.columns:
             df[c] = None
 
-    df_sorted = df.sort_values(cols)
-    df_sorted["prev_event_name"] = df_sorted.groupby(["user_pseudo_id", "event_params__ga_session_id"])["event_name"].shift(1)
-    df_sorted["prev_event_menu"] = df_sorted.groupby(["user_pseudo_id", "event_params__ga_session_id"])["event_params__menu_name"].shift(1) if "event_params__menu_name" in df_sorted.columns else None
+    # prev_event_* are shifted in (user, session, time) order. Events sharing a timestamp
+    # keep their event-log order (mergesort is stable), so the previous event is the one
+    # logged just before; sorting on the version/device columns used to reorder such ties.
+    df_sorted = df.sort_values(["user_pseudo_id", "event_params__ga_session_id", "event_datetime"], kind="mergesort")
+    df_sorted["prev_event_name"] = df_sorted.groupby(["user_pseudo_id", "event_params__ga_session_id"], observed=True)["event_name"].shift(1)
+    df_sorted["prev_event_menu"] = df_sorted.groupby(["user_pseudo_id", "event_params__ga_session_id"], observed=True)["event_params__menu_name"].shift(1) if "event_params__menu_name" in df_sorted.columns else None
 
     tech = df_sorted[df_sorted["event_name"].isin(["App Exception", "Ad Load Failed"])].copy()
 
@@ -856,61 +1116,43 @@ def _df_by_date(df: pd.DataFrame) -> pd.DataFrame:
         .reset_index()
     )
 
-    # ad breakdowns
-    def _breakdown(col: str, prefix: str) -> pd.DataFrame:
-        if col not in df.columns:
-            return pd.DataFrame(columns=["event_date"])
-        return (
-            df.groupby(["event_date", col])
-            .size()
+    # ad breakdowns: the three per-date value counts in one long-form groupby over int
+    # codes. factorize(sort=True) numbers each column's values in their natural order
+    # (numeric, or category order), offset per breakdown, so the unstacked columns come
+    # out in the order the per-column groupbys gave; dates lacking a value count 0
+    breakdowns = [
+        ("event_params__ad_network", "nwk_"),
+        ("event_params__ad_unit_id", "unt_"),
+        ("event_params__ad_instance", "ins_"),
+    ]
+    parts = []
+    labels: list[str] = []
+    for col, prefix in breakdowns:
+        if col in df.columns:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            present = codes >= 0
+            parts.append(pd.DataFrame({
+                "event_date": df["event_date"].array[present],
+                "_code": codes[present] + len(labels),
+            }))
+            labels += [f"{prefix}{u}" for u in uniques]
+
+    result = date_df
+    if labels:
+        long = pd.concat(parts, ignore_index=True)
+        wide = (
+            long.groupby(["event_date", "_code"]).size()
             .unstack(fill_value=0)
-            .add_prefix(prefix)
-            .reset_index()
+            .reindex(columns=range(len(labels)), fill_value=0)
         )
-
-    ads_network_df = _breakdown("event_params__ad_network", "nwk_")
-    ads_unit_df = _breakdown("event_params__ad_unit_id", "unt_")
-    ads_instance_df = _breakdown("event_params__ad_instance", "ins_")
-
-    result = (
-        date_df
-        .merge(ads_network_df, on="event_date", how="left")
-        .merge(ads_unit_df, on="event_date", how="left")
-        .merge(ads_instance_df, on="event_date", how="left")
-        .fillna(0)
-    )
+        wide.columns = labels
+        result = result.merge(wide.reset_index(), on="event_date", how="left")
+        # only the count columns: the weekday label is a categorical without a 0 category
+        result[labels] = result[labels].fillna(0).astype("int64")
 
     return result
 
 
-def _summarize_gold(g: pd.DataFrame) -> pd.Series:
-    gold_starting = 0.0
-    subset = g.loc[g["event_name"] == "Starting Currencies", "event_params__gold"] if "event_params__gold" in g.columns else pd.Series(dtype=float)
-    if len(subset) > 0:
-        gold_starting = pd.to_numeric(subset, errors="coerce").sum()
-
-    gold_gained = g.loc[
-        (g["event_name"] == "Earned Virtual Currency") & (g.get("event_params__currency_name") == "Gold"),
-        "event_params__earned_amount",
-    ].sum() if "event_params__earned_amount" in g.columns else 0.0
-
-    gold_spent = g.loc[
-        (g["event_name"] == "Spent Virtual Currency") & (g.get("event_params__currency_name") == "Gold"),
-        "event_params__spent_amount",
-    ].sum() if "event_params__spent_amount" in g.columns else 0.0
-
-    gold_delta = gold_gained - gold_spent
-    is_depted_for_doll = int((gold_spent > (gold_starting + gold_gained)) and (gold_spent >= 2000))
-
-    return pd.Series({
-        "gold_starting": gold_starting,
-        "gold_gained": gold_gained,
-        "gold_spent": gold_spent,
-        "gold_delta": gold_delta,
-        "is_depted_for_doll": is_depted_for_doll,
-    })
-
-
 def _df_by_sessions(cfg: MockConfig, df: pd.DataFrame) -> pd.DataFrame:
     session_groups = ["event_params__ga_session_id", "user_pseudo_id"]
 
@@ -919,103 +1161,109 @@ def _df_by_sessions(cfg: MockConfig, df: pd.DataFrame) -> pd.DataFrame:
     base_sessions = df_s[session_groups].drop_duplicates().reset_index(drop=True)
 
     session_duration = (
-        df_s.groupby(session_groups, as_index=False)["session_duration_seconds"].mean().round(2)
+        df_s.groupby(session_groups, as_index=False, observed=True)["session_duration_seconds"].mean().round(2)
     )
     session_duration["passed_10_min"] = session_duration["session_duration_seconds"] >= 600
 
     session_start = (
         df_s.loc[df_s["event_name"] == "Session Started"]
-        .groupby(session_groups, as_index=False)["session_start_time"].min()
+        .groupby(session_groups, as_index=False, observed=True)["session_start_time"].min()
         if "session_start_time" in df_s.columns else pd.DataFrame(columns=session_groups + ["session_start_time"])
     )
 
-    q_started = df_s.loc[df_s["event_name"] == "Question Started"]
+    # question starts always name their character; dropping the rare missing ones up front
+    # lets character_list use the built-in list aggregation
+    q_started = df_s.loc[df_s["event_name"] == "Question Started"].dropna(subset=["event_params__character_name"])
     qs_metrics = (
-        q_started.groupby(session_groups, as_index=False)
+        q_started.groupby(session_groups, as_index=False, observed=True)
         .agg(
             customer_character_count=("event_params__character_name", "nunique"),
-            character_list=("event_params__character_name", lambda x: [v for v in x.dropna().tolist()]),
+            character_list=("event_params__character_name", list),
             average_tier=("event_params__current_tier", "mean"),
         )
     )
 
     q_completed = df_s.loc[df_s["event_name"] == "Question Completed"]
     qc_metrics = (
-        q_completed.groupby(session_groups, as_index=False)
+        q_completed.groupby(session_groups, as_index=False, observed=True)
         .agg(average_wrong_answers=("event_params__answered_wrong", "mean"))
     )
 
+    # Per-session event counts and gold totals: one block of int indicators and float
+    # amounts summed in a single groupby pass. Consumable/energy counts stay NaN (then 0
+    # below) for sessions with no such purchase, as the separate filtered groupbys they
+    # replace left them.
     v = cfg.vocab
-    wheel = (
-        df_s.groupby(session_groups, as_index=False)["event_params__mini_game_ri"]
-        .agg(
-            Wheel_Impression=lambda x: (x == v.wheel_impression_ri).sum(),
-            Wheel_Skips=lambda x: (x == v.wheel_skip_ri).sum(),
-        )
-        .assign(Wheel_Spins=lambda d: d["Wheel_Impression"] - d["Wheel_Skips"])
-    )
-
-    ads = (
-        df_s.groupby(session_groups, as_index=False)["event_name"]
-        .agg(Ads_Watched_Count=lambda x: (x == "Ad Rewarded").sum())
-    )
-
-    # gold
-    gold = (
-        df_s.groupby(session_groups, as_index=False)
-        .apply(lambda g: _summarize_gold(g), include_groups=False)
-        .reset_index(drop=True)
-    )
+    name = df_s["event_name"]
+
+    def flag(mask: pd.Series) -> np.ndarray:
+        return mask.to_numpy(dtype=np.int64)
+
+    def gold_amount(mask, col: str) -> np.ndarray:
+        # masked amount per row; NaN and non-matching rows contribute 0
+        if col not in df_s.columns:
+            return np.zeros(len(df_s))
+        amount = pd.to_numeric(df_s[col], errors="coerce").to_numpy(dtype="float64")
+        return np.where(np.asarray(mask) & ~np.isnan(amount), amount, 0.0)
+
+    mini_game_ri = df_s["event_params__mini_game_ri"]
+    is_gold = df_s["event_params__currency_name"] == "Gold" if "event_params__currency_name" in df_s.columns else False
+    block = {
+        "Wheel_Impression": flag(mini_game_ri == v.wheel_impression_ri),
+        "Wheel_Skips": flag(mini_game_ri == v.wheel_skip_ri),
+        "Ads_Watched_Count": flag(name == "Ad Rewarded"),
+        "gold_starting": gold_amount(name == "Starting Currencies", "event_params__gold"),
+        "gold_gained": gold_amount((name == "Earned Virtual Currency") & is_gold, "event_params__earned_amount"),
+        "gold_spent": gold_amount((name == "Spent Virtual Currency") & is_gold, "event_params__spent_amount"),
+    }
 
-    # consumables purchased
-    consumable = pd.DataFrame(columns=session_groups)
+    shop_groups: dict[str, list[str]] = {}
     if "event_params__spent_to" in df_s.columns and "shop_consumable_item" in df_s.columns:
-        consumable = (
-            df_s.loc[df_s["event_params__spent_to"] == "Consumable Item"]
-            .groupby(session_groups, as_index=False)["shop_consumable_item"]
-            .agg(
-                Potions_Bought=lambda x: (x == v.potion_name).sum(),
-                Incenses_Bought=lambda x: (x == v.incense_name).sum(),
-                Amulets_Bought=lambda x: (x == v.amulet_name).sum(),
-            )
-        )
-
-    # energy spent
-    energy = pd.DataFrame(columns=session_groups)
+        bought = df_s["event_params__spent_to"] == "Consumable Item"
+        item = df_s["shop_consumable_item"]
+        block["_consumable"] = flag(bought)
+        block["Potions_Bought"] = flag(bought & (item == v.potion_name))
+        block["Incenses_Bought"] = flag(bought & (item == v.incense_name))
+        block["Amulets_Bought"] = flag(bought & (item == v.amulet_name))
+        shop_groups["_consumable"] = ["Potions_Bought", "Incenses_Bought", "Amulets_Bought"]
     if "event_params__spent_to" in df_s.columns:
-        energy = (
-            df_s.loc[df_s["event_params__spent_to"].isin([v.cauldron_name, v.alicin_name, v.coffee_name])]
-            .groupby(session_groups, as_index=False)["event_params__spent_to"]
-            .agg(
-                AliCin_Used=lambda x: (x == v.alicin_name).sum(),
-                Cauldron_Used=lambda x: (x == v.cauldron_name).sum(),
-                Coffee_Used=lambda x: (x == v.coffee_name).sum(),
-            )
-        )
-
-    # last event per session
-    df_l_sorted = df_s.sort_values(["event_datetime"], ascending=False)
-
-    def pick_last_valid(g: pd.DataFrame) -> pd.DataFrame:
-        non_skip = g[~g["event_name"].isin(SKIP_LAST_EVENTS)]
-        row = non_skip.iloc[0] if len(non_skip) > 0 else g.iloc[0]
-
-        group_keys = g.name
-        if not isinstance(group_keys, tuple):
-            group_keys = (group_keys,)
-        group_map = dict(zip(session_groups, group_keys))
-
-        return pd.DataFrame({
-            "event_params__ga_session_id": [group_map.get("event_params__ga_session_id")],
-            "user_pseudo_id": [group_map.get("user_pseudo_id")],
-            "last_event_name": [row["event_name"]],
-            "last_event_time": [row["event_datetime"]],
-        })
-
+        spent_to = df_s["event_params__spent_to"]
+        block["_energy"] = flag(spent_to.isin([v.cauldron_name, v.alicin_name, v.coffee_name]))
+        block["AliCin_Used"] = flag(spent_to == v.alicin_name)
+        block["Cauldron_Used"] = flag(spent_to == v.cauldron_name)
+        block["Coffee_Used"] = flag(spent_to == v.coffee_name)
+        shop_groups["_energy"] = ["AliCin_Used", "Cauldron_Used", "Coffee_Used"]
+
+    counts = pd.DataFrame(block, index=df_s.index).groupby([df_s[c] for c in session_groups], observed=True).sum()
+    counts.insert(2, "Wheel_Spins", counts["Wheel_Impression"] - counts["Wheel_Skips"])
+    gold_spent = counts["gold_spent"]
+    at = counts.columns.get_loc("gold_spent") + 1
+    counts.insert(at, "gold_delta", counts["gold_gained"] - gold_spent)
+    counts.insert(
+        at + 1,
+        "is_depted_for_doll",
+        ((gold_spent > counts["gold_starting"] + counts["gold_gained"]) & (gold_spent >= 2000)).astype("float64"),
+    )
+    for any_col, cols in shop_groups.items():
+        counts[cols] = counts[cols].where(counts.pop(any_col) > 0, axis=0)
+    counts = counts.reset_index()
+
+    # last event per session: the newest non-skip event, falling back to the newest event
+    # for sessions made only of skip events (per-group idxmax, no full sort). idxmax runs
+    # over the rows reversed so that among events sharing the newest timestamp the one
+    # logged last wins (the descending quicksort this replaced left such ties arbitrary).
+    df_rev = df_s.iloc[::-1]
+    newest = df_rev.groupby(session_groups, observed=True)["event_datetime"].idxmax()
+    newest_valid = (
+        df_rev.loc[~df_rev["event_name"].isin(SKIP_LAST_EVENTS)]
+        .groupby(session_groups, observed=True)["event_datetime"]
+        .idxmax()
+    )
+    last_rows = pd.concat([newest_valid, newest])
+    last_rows = last_rows[~last_rows.index.duplicated()]
     session_last_event = (
-        df_l_sorted.groupby(session_groups, group_keys=False)
-        .apply(pick_last_valid, include_groups=False)
-        .reset_index(drop=True)
+        df_s.loc[last_rows.to_numpy(), session_groups + ["event_name", "event_datetime"]]
+        .rename(columns={"event_name": "last_event_name", "event_datetime": "last_event_time"})
     )
 
     result = (
@@ -1024,11 +1272,7 @@ def _df_by_sessions(cfg: MockConfig, df: pd.DataFrame) -> pd.DataFrame:
         .merge(session_start, on=session_groups, how="left")
         .merge(qs_metrics, on=session_groups, how="left")
         .merge(qc_metrics, on=session_groups, how="left")
-        .merge(wheel, on=session_groups, how="left")
-        .merge(ads, on=session_groups, how="left")
-        .merge(gold, on=session_groups, how="left")
-        .merge(consumable, on=session_groups, how="left")
-        .merge(energy, on=session_groups, how="left")
+        .merge(counts, on=session_groups, how="left")
         .merge(session_last_event, on=session_groups, how="left")
     )
 
@@ -1070,7 +1314,7 @@ def _df_by_users(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     df["session_duration_minutes"] = df["session_duration_seconds"] / 60
 
     user_df = (
-        df.groupby(user_key, as_index=False)
+        df.groupby(user_key, as_index=False, observed=True)
         .agg(
             first_event_date=("event_date", "min"),
             total_sessions=("event_params__ga_session_id", "nunique"),
@@ -1092,18 +1336,23 @@ def _df_by_users(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     )
 
     user_playtime = (
-        df_sessions.groupby(user_key, as_index=False)
+        df_sessions.groupby(user_key, as_index=False, observed=True)
         .agg(total_playtime_minutes=("session_duration_minutes", "sum"))
     )
 
     user_df = user_df.merge(user_playtime, on=user_key, how="left")
 
-    def count_events(event: str) -> pd.Series:
-        return df[df["event_name"] == event].groupby(user_key).size().rename(event)
-
-    counts = pd.DataFrame({user_key: user_df[user_key]})
-    for ev in ["Ad Rewarded", "Question Completed", "Game Ended", "App Removed", "Session Started"]:
-        counts = counts.merge(count_events(ev), on=user_key, how="left")
+    # per-user counts of a few events: one (user, event) size table instead of a scan per event
+    counted_events = ["Ad Rewarded", "Question Completed", "Game Ended", "App Removed", "Session Started"]
+    event_counts = (
+        df[df["event_name"].isin(counted_events)]
+        .groupby([user_key, "event_name"], observed=True)
+        .size()
+        .unstack(fill_value=0)
+        .reindex(columns=counted_events)
+        .rename_axis(columns=None)
+    )
+    counts = pd.DataFrame({user_key: user_df[user_key]}).merge(event_counts, on=user_key, how="left")
 
     conversion_events = [
         "event_params__pp_accepted",
@@ -1117,21 +1366,28 @@ def _df_by_users(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
         "event_params__drag",
     ]
 
-    def check_bool_event(event: str) -> pd.Series:
-        if event not in df.columns:
-            return pd.Series(0, index=user_df[user_key], name=event)
-        s = df[event].astype(str).str.lower()
-        col = s.isin(["true", "1", "yes", "y"]).astype(int)
-        return col.groupby(df[user_key]).max().rename(event)
-
-    for ev in conversion_events:
-        counts = counts.merge(check_bool_event(ev), on=user_key, how="left")
+    def is_truthy(values: pd.Series) -> np.ndarray:
+        # lowercase each distinct value once, then map the flag back through the codes
+        codes, uniques = pd.factorize(values)
+        truthy = np.array([str(u).lower() in ("true", "1", "yes", "y") for u in uniques] + [False])
+        return truthy[codes].astype(np.int8)
+
+    # all conversion flags as one int8 block, reduced with a single groupby max;
+    # events missing from the frame count as 0
+    present = [ev for ev in conversion_events if ev in df.columns]
+    conversions = (
+        pd.DataFrame({ev: is_truthy(df[ev]) for ev in present}, index=df.index)
+        .groupby(df[user_key], observed=True)
+        .max()
+        .reindex(columns=conversion_events, fill_value=0)
+    )
+    counts = counts.merge(conversions, on=user_key, how="left")
 
     # tutorial
     if "event_params__tutorial_video" in df.columns:
         tutorials = (
             df[(df["event_params__tutorial_video"] == "tutorial_video") & (df["event_name"] == "Video Watched")]
-            .groupby(user_key)
+            .groupby(user_key, observed=True)
             .size()
             .rename("tutorial_completed")
         )
@@ -1142,7 +1398,7 @@ def _df_by_users(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     if "event_params__wecolme_video" in df.columns:
         wecolme_video_played = (
             (df["event_params__wecolme_video"] == "wecolme_video")
-            .groupby(df[user_key])
+            .groupby(df[user_key], observed=True)
             .any()
             .astype(int)
             .rename("wecolme_video_played")
@@ -1218,16 +1474,26 @@ def _df_by_users(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     return user_df, user_bool_df
 
 
-def _write_derived(cfg: MockConfig, out_root: Path, schema_from: Path | None) -> None:
+def _write_derived(cfg: MockConfig, out_root: Path, schema_from: Path | None, parquet: bool = False) -> None:
     csv_dir = out_root / "data" / "csv"
     csv_dir.mkdir(parents=True, exist_ok=True)
 
+    def write(frame: pd.DataFrame, csv_path: Path) -> None:
+        # parquet (same stem) when asked for and pyarrow is available, CSV otherwise
+        if parquet and _maybe_write_parquet(frame, csv_path.with_suffix(".parquet")):
+            return
+        frame.to_csv(csv_path, index=False)
+
     df = _build_events(cfg)
+    for c in DERIVED_CATEGORICAL_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
 
+    by_users, users_meta = _df_by_users(df)
     dfs = {
         "by_sessions": _df_by_sessions(cfg, df),
-        "by_users": _df_by_users(df)[0],
-        "users_meta": _df_by_users(df)[1],
+        "by_users": by_users,
+        "users_meta": users_meta,
         "by_questions": _df_by_questions(cfg, df),
         "by_ads": _df_by_ads(df),
         "by_date": _df_by_date(df),
@@ -1291,18 +1557,18 @@ def _write_derived(cfg: MockConfig, out_root: Path, schema_from: Path | None) ->
             "event_params__tutorial_video",
         ]
 
-    out_df = ensure_columns(df.copy(), desired_cols)
+    out_df = ensure_columns(df, desired_cols)
     for c in ["event_datetime", "session_start_time", "session_end_time", "event_date"]:
         if c in out_df.columns:
             out_df[c] = pd.to_datetime(out_df[c], utc=True, errors="coerce")
-    out_df.to_csv(processed_path, index=False)
+    write(out_df, processed_path)
 
     for name, dfx in dfs.items():
         fname = f"{name}_data.csv"
         fpath = csv_dir / fname
         desired = read_csv_header(schema_from / fname) if schema_from is not None else None
-        dfx_to_write = ensure_columns(dfx.copy(), desired) if desired is not None else dfx
-        dfx_to_write.to_csv(fpath, index=False)
+        dfx_to_write = ensure_columns(dfx, desired) if desired is not None else dfx
+        write(dfx_to_write, fpath)
 
 
 def _write_raw(cfg: MockConfig, out_root: Path) -> None:
@@ -1315,26 +1581,28 @@ def _write_raw(cfg: MockConfig, out_root: Path) -> None:
     jsonl_path = raw_dir / "pulled_from_bq.jsonl"
     raw_df.to_json(jsonl_path, orient="records", lines=True)
 
-    # Optionally write parquet if pyarrow exists.
+    # Optionally write parquet if pyarrow exists; skip preparing the copy otherwise.
+    if not _has_pyarrow():
+        return
     try:
-        df_for_parquet = raw_df.copy()
-        for c in ["user_ltv", "event_dimensions", "ecommerce", "collected_traffic_source"]:
-            if c in df_for_parquet.columns:
-                df_for_parquet[c] = df_for_parquet[c].apply(
-                    lambda x: None if isinstance(x, dict) and len(x) == 0 else x
-                )
-        _maybe_write_parquet(df_for_parquet, raw_dir / "pulled_from_bq.parquet")
+        _maybe_write_parquet(_raw_arrow_table(raw_df), raw_dir / "pulled_from_bq.parquet")
     except Exception:
         # Parquet is a best-effort convenience; JSONL is the supported raw artifact.
         pass
 
 
-def generate_all(cfg: MockConfig, out_root: Path, schema_from: Path | None = None, kind: str = "raw") -> None:
+def generate_all(
+    cfg: MockConfig,
+    out_root: Path,
+    schema_from: Path | None = None,
+    kind: str = "raw",
+    parquet: bool = False,
+) -> None:
     out_root = out_root.resolve()
 
     if kind in ("raw", "both"):
         _write_raw(cfg, out_root)
     if kind in ("derived", "both"):
-        _write_derived(cfg, out_root, schema_from)
+        _write_derived(cfg, out_root, schema_from, parquet=parquet)
 
-    (out_root / "config_used.json").write_text(json.dumps(asdict(cfg), indent=2), encoding="utf-8")
+    (out_root / "config_used.json").write_text(json.dumps(cfg.to_dict(), indent=2), encoding="utf-8")
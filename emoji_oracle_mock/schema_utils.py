@@ -17,7 +17,9 @@ def read_csv_header(path: Path) -> list[str] | None:
 
 
 def ensure_columns(df, columns: Iterable[str]):
-    for c in columns:
-        if c not in df.columns:
-            df[c] = None
-    return df[columns]
+    """Return df's `columns` in order; ones df lacks come back empty (all-NA) and df is left as is."""
+    columns = list(columns)
+    if all(c in df.columns for c in columns):
+        return df[columns]
+    # one reindex builds the frame instead of inserting each missing column into df
+    return df.reindex(columns=columns)
@@ -0,0 +1,61 @@
+import pytest
+
+from emoji_oracle_mock import cli
+
+
+def _help_for(prog: str) -> str:
+    return cli._STATIC_HELP.format(prog=prog)
+
+
+def test_static_help_matches_argparse():
+    # same tokens in the same order; line wrapping differs between argparse releases
+    parser = cli._get_parser()
+    assert _help_for(parser.prog).split() == parser.format_help().split()
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["-h"], ["--kind", "raw", "-h", "--users", "x"]])
+def test_help_flag_does_not_build_the_parser(argv, capsys, monkeypatch):
+    monkeypatch.setattr(cli.sys, "argv", ["emoji-oracle-mock"])
+    cli._get_parser.cache_clear()
+    assert cli.main(argv) == 0
+    assert capsys.readouterr().out == _help_for("emoji-oracle-mock")
+    assert cli._get_parser.cache_info().currsize == 0
+
+
+@pytest.mark.parametrize("argv", [["--out", "--help"], ["--config", "-h"]])
+def test_help_token_as_a_value_is_not_help(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(argv)
+    assert exc.value.code == 2
+    assert "expected one argument" in capsys.readouterr().err
+
+
+def test_fast_parse_switches():
+    args = cli._fast_parse(["--kind", "derived", "--parquet", "--users=5"])
+    assert args == cli._Args(kind="derived", parquet=True, users=5)
+    assert cli._fast_parse(["--kind", "nope"]) is None
+
+
+@pytest.mark.parametrize("argv", [
+    ["--out", "-x"],
+    ["--config", "-v"],
+    ["--kind", "raw", "--out"],
+])
+def test_missing_value_falls_back_to_argparse(argv, capsys):
+    assert cli._fast_parse(argv) is None
+    with pytest.raises(SystemExit) as exc:
+        cli.main(argv)
+    assert exc.value.code == 2
+    assert "expected one argument" in capsys.readouterr().err
+
+
+def test_negative_number_is_a_value():
+    assert cli._fast_parse(["--seed", "-1"]) == cli._Args(seed=-1)
+
+
+@pytest.mark.parametrize("argv", [["--seed", "-1"], ["--users=-5"], ["--days", "-3"]])
+def test_negative_counts_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(argv)
+    assert exc.value.code == 2
+    assert "must be a non-negative integer" in capsys.readouterr().err
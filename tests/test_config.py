@@ -0,0 +1,51 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from emoji_oracle_mock import config_model
+from emoji_oracle_mock.config_model import MockConfig, VocabConfig
+
+EXAMPLE = Path(config_model.__file__).parent / "config" / "example.json"
+
+
+@pytest.fixture(params=["json", "msgspec"])
+def decoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(config_model, "msgspec", None)
+    else:
+        monkeypatch.setattr(config_model, "msgspec", pytest.importorskip("msgspec"))
+    return request.param
+
+
+def _write(tmp_path, obj):
+    path = tmp_path / "cfg.json"
+    path.write_text(json.dumps(obj), encoding="utf-8")
+    return path
+
+
+def test_nested_vocab(tmp_path, decoder):
+    cfg = MockConfig.load(_write(tmp_path, {"users": 5, "vocab": {"potion_name": "Elixir", "characters": ["a", "b"]}}))
+    assert cfg == MockConfig(users=5, vocab=VocabConfig(potion_name="Elixir", characters=("a", "b")))
+
+
+def test_example_config_round_trips(decoder):
+    cfg = MockConfig.load(EXAMPLE)
+    assert MockConfig.from_dict(json.loads(json.dumps(cfg.to_dict()))) == cfg
+
+
+def test_top_level_vocab_keys_are_unknown(tmp_path, decoder):
+    with pytest.raises(TypeError, match="Unknown MockConfig keys: potion_name"):
+        MockConfig.load(_write(tmp_path, {"potion_name": "Elixir"}))
+
+
+def test_vocab_shaped_object_elsewhere_is_not_a_vocab(tmp_path, decoder):
+    with pytest.raises(TypeError, match="Unknown MockConfig keys: extra"):
+        MockConfig.load(_write(tmp_path, {"extra": {"potion_name": "Elixir"}}))
+
+
+@pytest.mark.parametrize("body", ["{}", "null"])
+def test_empty_config(tmp_path, decoder, body):
+    path = tmp_path / "cfg.json"
+    path.write_text(body, encoding="utf-8")
+    assert MockConfig.load(path) == MockConfig()
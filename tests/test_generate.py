@@ -0,0 +1,110 @@
+import pandas as pd
+
+from emoji_oracle_mock.config_model import MockConfig
+from emoji_oracle_mock.generate import _df_by_date, _df_by_questions, _df_by_sessions, _df_technical_events
+
+
+def _events() -> pd.DataFrame:
+    day1, day2 = pd.Timestamp("2026-01-01", tz="UTC"), pd.Timestamp("2026-01-02", tz="UTC")
+    return pd.DataFrame({
+        "event_date": [day1, day1, day1, day2, day2],
+        "ts_weekday": pd.Categorical(["Perşembe"] * 3 + ["Cuma"] * 2),
+        "user_pseudo_id": ["u1", "u1", "u2", "u2", "u2"],
+        "event_name": ["Ad Rewarded", "Ad Loaded", "First Open", "Ad Loaded", "Ad Rewarded"],
+        "device__operating_system": ["ANDROID", "ANDROID", "IOS", "IOS", "IOS"],
+        "event_params__ga_session_id": [1, 1, 2, 3, 3],
+        # category order is not the lexical order of the labels
+        "event_params__ad_network": pd.Categorical(
+            ["unity", "admob", None, "unity", "unity"], categories=["unity", "admob"]
+        ),
+        # numeric labels: 2 comes before 10
+        "event_params__ad_unit_id": [10, 2, None, 2, 10],
+        "event_params__ad_instance": ["b", "a", None, None, None],
+    })
+
+
+def test_by_date_breakdown_columns_keep_value_order():
+    df = _events()
+    result = _df_by_date(df.copy())
+
+    # the per-column groupby/unstack the fused breakdown replaced
+    expected = []
+    for col, prefix in [
+        ("event_params__ad_network", "nwk_"),
+        ("event_params__ad_unit_id", "unt_"),
+        ("event_params__ad_instance", "ins_"),
+    ]:
+        wide = df.groupby(["event_date", col], observed=True).size().unstack(fill_value=0).add_prefix(prefix)
+        expected += list(wide.columns)
+
+    assert expected == ["nwk_unity", "nwk_admob", "unt_2.0", "unt_10.0", "ins_a", "ins_b"]
+    assert list(result.columns[-len(expected):]) == expected
+    assert result[expected].to_numpy().tolist() == [[1, 1, 1, 1, 1, 1], [2, 0, 1, 1, 0, 0]]
+    assert (result[expected].dtypes == "int64").all()
+
+
+def test_technical_events_prev_event_follows_log_order_on_ties():
+    t0, t1 = pd.Timestamp("2026-01-01 10:00:00", tz="UTC"), pd.Timestamp("2026-01-01 10:00:05", tz="UTC")
+    df = pd.DataFrame({
+        "user_pseudo_id": ["u1"] * 3,
+        "event_params__ga_session_id": [1] * 3,
+        "event_datetime": [t0, t1, t1],
+        # sorting the tie on app version would put the exception before the menu event
+        "app_info__version": ["1.0.7", "1.0.7", "1.0.5"],
+        "device__mobile_marketing_name": ["phone"] * 3,
+        "device__operating_system_version": ["14"] * 3,
+        "event_name": ["Session Started", "Menu Opened", "App Exception"],
+        "event_params__menu_name": [None, "Scroll Menu", None],
+    })
+    tech = _df_technical_events(df)
+    assert tech[["event_name", "prev_event_name", "prev_event_menu"]].values.tolist() == [
+        ["App Exception", "Menu Opened", "Scroll Menu"],
+    ]
+
+
+def _session(events: list[tuple[str, str]], session_id: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "user_pseudo_id": "u1",
+        "event_params__ga_session_id": session_id,
+        "event_datetime": [pd.Timestamp(f"2026-01-01 10:00:{sec}", tz="UTC") for sec, _ in events],
+        "event_name": [name for _, name in events],
+        "session_duration_seconds": 60.0,
+        "event_params__character_name": "t",
+        "event_params__current_tier": 1,
+        "event_params__answered_wrong": 0,
+        "event_params__mini_game_ri": None,
+    })
+
+
+def test_by_sessions_last_event_is_last_logged_on_ties():
+    df = pd.concat([
+        # tied newest events: the one logged last wins
+        _session([("00", "Session Started"), ("30", "Question Completed"), ("30", "Game Ended")], 1),
+        _session([("00", "Session Started"), ("30", "Game Ended"), ("30", "Question Completed")], 2),
+        # skip events are passed over, even when logged last in the tie
+        _session([("00", "Session Started"), ("30", "Game Ended"), ("30", "User Engagement")], 3),
+        # a session of skip events only falls back to its newest, last-logged event
+        _session([("00", "Screen Viewed"), ("30", "App Updated"), ("30", "User Engagement")], 4),
+    ], ignore_index=True)
+    result = _df_by_sessions(MockConfig(), df).set_index("event_params__ga_session_id")
+    assert result["last_event_name"].to_dict() == {
+        1: "Game Ended",
+        2: "Question Completed",
+        3: "Game Ended",
+        4: "User Engagement",
+    }
+
+
+def test_by_questions_totals_are_int64():
+    df = _session([("00", "Question Started"), ("10", "Question Completed"), ("20", "Ad Rewarded")], 1)
+    df = df.assign(
+        question_address="t - T: 1 - Q: 1",
+        event_params__current_question_index=1,
+        shop_consumable_item=None,
+        event_params__spent_to=None,
+        event_params__menu_name=None,
+    )
+    result = _df_by_questions(MockConfig(), df)
+    totals = ["question_started", "potions_bought", "answered_correct", "ads_watched", "scroll_opened"]
+    assert (result[totals].dtypes == "int64").all()
+    assert result[totals].to_numpy().tolist() == [[1, 0, 1, 1, 0]]
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from emoji_oracle_mock import cli
+from emoji_oracle_mock.generate import PARQUET_CHUNK_ROWS, _maybe_write_parquet, _raw_arrow_schema
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _frame(n: int) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "n": np.arange(n),
+        "s": np.where(np.arange(n) % 3 == 0, None, "x").astype(object),
+        "c": pd.Categorical(np.array(["p", "q"])[np.arange(n) % 2]),
+    })
+    # the first chunks hold no strings at all: the shared schema must still type "s" as string
+    df.loc[: n // 2, "s"] = None
+    return df
+
+
+def _row_groups(path) -> list[int]:
+    meta = pq.ParquetFile(path).metadata
+    return [meta.row_group(i).num_rows for i in range(meta.num_row_groups)]
+
+
+def _assert_round_trip(df: pd.DataFrame, path) -> None:
+    back = pd.read_parquet(path)
+    assert list(back.columns) == list(df.columns)
+    assert len(back) == len(df)
+    assert back["n"].equals(df["n"])
+    assert back["c"].equals(df["c"])
+    assert back["s"].isna().equals(df["s"].isna())
+    s_type = pq.ParquetFile(path).schema_arrow.field("s").type
+    assert pa.types.is_string(s_type) or pa.types.is_large_string(s_type)
+
+
+@pytest.mark.parametrize("row_group_rows, expected", [
+    (2_500, [2_500, 2_500, 1_000]),
+    (1_000, [1_000] * 6),
+    (100_000, [6_000]),
+])
+def test_streamed_row_groups(tmp_path, row_group_rows, expected):
+    df = _frame(6_000)
+    path = tmp_path / "t.parquet"
+    assert _maybe_write_parquet(df, path, chunk_rows=1_000, row_group_rows=row_group_rows)
+    assert _row_groups(path) == expected
+    _assert_round_trip(df, path)
+
+
+def test_streamed_frame_above_chunk_size(tmp_path):
+    df = _frame(PARQUET_CHUNK_ROWS + 59_265)
+    path = tmp_path / "t.parquet"
+    assert _maybe_write_parquet(df, path)
+    assert _row_groups(path) == [len(df)]
+    _assert_round_trip(df, path)
+
+
+def test_derived_parquet_matches_csv(tmp_path):
+    args = ["--kind", "derived", "--users", "50", "--days", "7"]
+    assert cli.main(["--out", str(tmp_path / "csv"), *args]) == 0
+    assert cli.main(["--out", str(tmp_path / "pq"), *args, "--parquet"]) == 0
+
+    csvs = sorted((tmp_path / "csv" / "data" / "csv").glob("*_data.csv"))
+    parquets = sorted((tmp_path / "pq" / "data" / "csv").glob("*_data.parquet"))
+    assert [p.stem for p in parquets] == [p.stem for p in csvs]
+    assert not list((tmp_path / "pq" / "data" / "csv").glob("*.csv"))
+    for csv_path, pq_path in zip(csvs, parquets):
+        expected = pd.read_csv(csv_path)
+        back = pd.read_parquet(pq_path)
+        assert list(back.columns) == list(expected.columns), pq_path.name
+        assert len(back) == len(expected), pq_path.name
+
+
+def test_raw_parquet_is_typed(tmp_path):
+    assert cli.main(["--out", str(tmp_path), "--kind", "raw", "--users", "50", "--days", "7"]) == 0
+    path = tmp_path / "raw" / "pulled_from_bq.parquet"
+    assert pq.ParquetFile(path).schema_arrow.remove_metadata().equals(_raw_arrow_schema())
+
+    table = pq.read_table(path)
+    rows = pd.read_json(tmp_path / "raw" / "pulled_from_bq.jsonl", lines=True)
+    assert table.num_rows == len(rows)
+    for name in ["event_name", "user_pseudo_id", "platform", "device", "geo"]:
+        assert table[name].to_pylist() == rows[name].tolist(), name
+    # the typed value struct has every kind as a field; compare the kinds that are set
+    assert _set_values(table["event_params"].to_pylist()) == _set_values(rows["event_params"])
+
+
+def _set_values(rows) -> list:
+    return [
+        [{"key": p["key"], "value": {k: v for k, v in p["value"].items() if v is not None}} for p in params]
+        for params in rows
+    ]